@@ -0,0 +1,130 @@
+# check_service.py
+# Error-path check for main/service.py.
+# Starts the service on an ephemeral 127.0.0.1 port and sends malformed,
+# non-finite and oversized requests. Every request must get an HTTP answer with
+# the expected status and a valid JSON body, and the connection must be usable
+# (or closed, for 413) afterwards.
+#
+#   python benchmarks/check_service.py
+
+import os
+import sys
+import json
+import socket
+import asyncio
+import threading
+
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, root_dir)
+
+from main import service
+
+# (label, body, expected status)
+CASES = [
+    ("conditions", {"conditions": [{"pair": "CO2/CH4", "T": 343.15, "pH": 9}]}, 200),
+    ("environment", {"conditions": [{"pair": "H2/H+", "environment": "acidic_ocean"}]}, 200),
+    ("scalar columns", {"columns": {"pair": "CO2/CH4", "T": 300, "pH": 7}}, 200),
+    ("array body", [1, 2, 3], 400),
+    ("string condition", {"conditions": ["x"]}, 400),
+    ("string body", "conditions", 400),
+    ("conc not an object", {"conditions": [{"pair": "CO2/CH4", "T": 300, "pH": 7, "conc": [1]}]}, 400),
+    ("unknown pair", {"conditions": [{"pair": "nope", "T": 300, "pH": 7}]}, 400),
+    ("unknown species", {"conditions": [{"pair": "CO2/CH4", "T": 300, "pH": 7, "conc": {"XX": 1}}]}, 400),
+    ("missing T", {"conditions": [{"pair": "CO2/CH4", "pH": 7}]}, 400),
+    ("NaN T", {"conditions": [{"pair": "CO2/CH4", "T": "nan", "pH": 7}]}, 400),
+    ("inf pH", {"conditions": [{"pair": "CO2/CH4", "T": 300, "pH": "inf"}]}, 400),
+    ("NaN I", {"conditions": [{"pair": "CO2/CH4", "T": 300, "pH": 7, "I": "nan"}]}, 400),
+    ("negative I", {"conditions": [{"pair": "CO2/CH4", "T": 300, "pH": 7, "I": -1}]}, 400),
+    ("zero conc", {"conditions": [{"pair": "CO2/CH4", "T": 300, "pH": 7, "conc": {"CO2": 0}}]}, 400),
+    ("NaN column T", {"columns": {"pair": "CO2/CH4", "T": [300, "nan"], "pH": 7}}, 400),
+    ("columns without pH", {"columns": {"pair": "CO2/CH4", "T": [300]}}, 400),
+    ("columns conc not an object", {"columns": {"pair": "CO2/CH4", "T": 300, "pH": 7, "conc": 1}}, 400),
+    ("zero T", {"conditions": [{"pair": "CO2/CH4", "T": 0, "pH": 7}]}, 400),
+    ("tiny T", {"conditions": [{"pair": "CO2/CH4", "T": 1e-300, "pH": 7}]}, 400),
+    ("pH above 14", {"conditions": [{"pair": "CO2/CH4", "T": 300, "pH": 70}]}, 400),
+    ("huge I", {"conditions": [{"pair": "CO2/CH4", "T": 300, "pH": 7, "I": 1e6}]}, 400),
+    ("H+ in conc", {"conditions": [{"pair": "CO2/CH4", "T": 300, "pH": 7, "conc": {"H+": 1e-3}}]}, 400),
+    ("zero column T", {"columns": {"pair": "CO2/CH4", "T": [300, 0], "pH": 7}}, 400),
+    ("column pH below 0", {"columns": {"pair": "CO2/CH4", "T": 300, "pH": [-1]}}, 400),
+    ("unknown activity model", {"conditions": [{"pair": "CO2/CH4", "T": 300, "pH": 7, "I": 0.7}],
+                                "activity": "nope"}, 400),
+]
+
+
+def _start():
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(asyncio.start_server(service.handle_connection, "127.0.0.1", 0))
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return loop, server.sockets[0].getsockname()[1]
+
+
+def _request(sock, body, raw=None):
+    """Sends one POST /evaluate on sock; returns (status, decoded JSON body, Connection header)."""
+    data = raw if raw is not None else json.dumps(body).encode()
+    sock.sendall(b"POST /evaluate HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                 + f"Content-Length: {len(data)}\r\n\r\n".encode() + data)
+    return _read_response(sock)
+
+
+def _read_response(sock):
+    reader = sock.makefile("rb")
+    status = int(reader.readline().split()[1])
+    headers = {}
+    while (line := reader.readline()) not in (b"\r\n", b""):
+        key, _, value = line.decode("latin-1").partition(":")
+        headers[key.strip().lower()] = value.strip()
+    payload = reader.read(int(headers["content-length"]))
+    # parse_constant rejects NaN/Infinity, which json.loads would otherwise accept
+    return status, json.loads(payload, parse_constant=lambda name: 1 / 0), headers.get("connection")
+
+
+def check_service():
+    failures = []
+    loop, port = _start()
+    with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+        # One keep-alive connection for all cases: a dropped connection fails every later case
+        for label, body, expected in CASES:
+            try:
+                status, payload, _ = _request(sock, body)
+            except (OSError, ValueError, ZeroDivisionError, IndexError) as e:
+                failures.append(f"{label}: no valid JSON response ({type(e).__name__}: {e})")
+                break
+            print(f"{label:<28} {status}  {payload.get('error', '') if isinstance(payload, dict) else ''}")
+            if status != expected:
+                failures.append(f"{label}: status {status}, expected {expected}")
+
+    # Negative Content-Length: 400, then close (the body cannot be skipped)
+    with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+        sock.sendall(b"POST /evaluate HTTP/1.1\r\nHost: localhost\r\nContent-Length: -5\r\n\r\n")
+        try:
+            status, _, connection = _read_response(sock)
+        except (OSError, ValueError, IndexError) as e:
+            status, connection = None, f"no response ({type(e).__name__})"
+        print(f"{'negative Content-Length':<28} {status}  Connection: {connection}")
+        if status != 400 or connection != "close":
+            failures.append(f"negative Content-Length: status {status}, Connection {connection}; expected 400, close")
+
+    # Oversized body: 413, then the server closes instead of parsing the rest as a new request
+    service.MAX_BODY, max_body = 64, service.MAX_BODY
+    try:
+        with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+            status, _, connection = _request(sock, None, raw=b"x" * 1000)
+            print(f"{'oversized body':<28} {status}  Connection: {connection}")
+            if status != 413 or connection != "close":
+                failures.append(f"oversized body: status {status}, Connection {connection}; expected 413, close")
+            elif sock.recv(1):
+                failures.append("oversized body: server sent more data after 413")
+    finally:
+        service.MAX_BODY = max_body
+        loop.call_soon_threadsafe(loop.stop)
+    return failures
+
+
+if __name__ == "__main__":
+    failures = check_service()
+    if failures:
+        print("\n❌ Service error paths:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\n✅ Every malformed request got a JSON error response.")
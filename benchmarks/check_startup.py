@@ -0,0 +1,84 @@
+# check_startup.py
+# Startup-time regression check for the compute entry points.
+# Each module is imported in a fresh interpreter, the way its script would run,
+# and the check fails if the import pulls in the plotting stack or exceeds the time budget.
+#
+#   python benchmarks/check_startup.py [--budget 1.5]
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# (script directory, module) — imported the way the script resolves it: main/ modules as
+# main.<module> from the repo root, the others with their own directory first
+COMPUTE_MODULES = [
+    ("main", "thermodynamics"),
+    ("main", "records"),
+    ("main", "coupling"),
+    ("main", "kinetics"),
+    ("main", "main"),
+    ("optimization", "optimize"),
+    ("sensitivity", "sensitivity"),
+]
+
+PLOTTING_MODULES = ["matplotlib", "seaborn", "scipy"]
+
+PROBE = """
+import sys, time, json
+sys.path[:0] = {path!r}
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "plotting": sorted(m for m in {plotting!r} if m in sys.modules),
+}}))
+"""
+
+
+def probe_import(script_dir, module):
+    if script_dir == "main":
+        path, module = [root_dir], f"main.{module}"
+    else:
+        path = [os.path.join(root_dir, script_dir), root_dir]
+    code = PROBE.format(
+        path=path,
+        module=module,
+        plotting=PLOTTING_MODULES,
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=root_dir, capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def check_startup(budget=1.5):
+    failures = []
+    for script_dir, module in COMPUTE_MODULES:
+        result = probe_import(script_dir, module)
+        label = f"{script_dir}/{module}.py"
+        print(f"{label:<28} {result['seconds'] * 1000:8.1f} ms  plotting: {result['plotting'] or '-'}")
+        if result["plotting"]:
+            failures.append(f"{label} imports {', '.join(result['plotting'])} at load")
+        if result["seconds"] > budget:
+            failures.append(f"{label} took {result['seconds']:.2f} s to import (budget {budget:.2f} s)")
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Startup-time regression check for compute modules.")
+    parser.add_argument("--budget", type=float, default=1.5, help="max import time per module in seconds")
+    args = parser.parse_args()
+
+    failures = check_startup(args.budget)
+    if failures:
+        print("\n❌ Startup regression:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\n✅ Compute modules import without the plotting stack.")
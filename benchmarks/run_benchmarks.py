@@ -0,0 +1,350 @@
+# run_benchmarks.py
+# Benchmark harness for the thermodynamic kernels and the end-to-end pipelines.
+# Results are written to benchmarks/results/<commit>.json; pass --compare with an
+# earlier result file to flag slowdowns beyond --threshold.
+#
+#   python benchmarks/run_benchmarks.py                      # everything
+#   python benchmarks/run_benchmarks.py --quick              # skip full pipelines
+#   python benchmarks/run_benchmarks.py --filter optimize --compare benchmarks/results/abc1234.json
+
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import contextlib
+import tempfile
+import statistics
+import subprocess
+
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+results_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# Repo root first so "main" resolves to the package, then the script directories
+sys.path[:0] = [root_dir, os.path.join(root_dir, "optimization"), os.path.join(root_dir, "sensitivity")]
+
+import numpy as np
+
+from main.thermodynamics import (
+    calculate_Q,
+    adjust_E0,
+    calculate_deltaG,
+    calculate_exergy_efficiency_from_H
+)
+from main.data import redox_pairs, environments
+
+KERNEL_POINTS = 10_000
+OPTIMIZE_STEPS = [10, 20, 40, 80]
+PIPELINES = [
+    ("main", "main/main.py"),
+    ("optimization", "optimization/optimize.py"),
+    ("sensitivity", "sensitivity/sensitivity.py"),
+]
+
+BENCHMARKS = []
+
+
+def benchmark(name, repeat=5, group="kernels"):
+    """Registers fn() as a benchmark; fn may return the number of evaluated points."""
+    def register(fn):
+        BENCHMARKS.append({"name": name, "fn": fn, "repeat": repeat, "group": group})
+        return fn
+    return register
+
+
+# === Kernels: scalar vs vectorized ===
+
+def _kernel_grid():
+    rng = np.random.default_rng(0)
+    return rng.uniform(4, 10, KERNEL_POINTS), rng.uniform(280, 400, KERNEL_POINTS)
+
+
+@benchmark("kernel_scalar")
+def bench_kernel_scalar():
+    pH_values, T_values = _kernel_grid()
+    pair = redox_pairs[1]
+    for pH, T in zip(pH_values, T_values):
+        conc = pair["conc"].copy()
+        conc["H+"] = 10 ** (-pH)
+        Q = calculate_Q({**pair, "conc": conc})
+        E = adjust_E0(pair["E0"], pair["n"], T, Q)
+        dG = calculate_deltaG(E, pair["n"])
+        calculate_exergy_efficiency_from_H(dG, pair["delta_H"])
+    return KERNEL_POINTS
+
+
+@benchmark("kernel_vectorized")
+def bench_kernel_vectorized():
+    from main.records import PAIRS
+    pH_values, T_values = _kernel_grid()
+    pair = PAIRS[1]
+    pair.exergy_efficiency_H(pair.deltaG(T_values, pH_values))
+    return KERNEL_POINTS
+
+
+@benchmark("kernel_speciated")
+def bench_kernel_speciated():
+    from main.records import PAIRS
+    pH_values, T_values = _kernel_grid()
+    PAIRS[1].deltaG(T_values, pH_values, speciation=True, I=0.7, activity="davies")
+    return KERNEL_POINTS
+
+
+# Tables are built in a scratch directory (removed at exit), never in surrogates/;
+# the first repeat includes the build, min/median are the lookups
+_scratch = None
+
+
+@benchmark("surrogate_speciated")
+def bench_surrogate_speciated():
+    global _scratch
+    from main.records import PAIRS
+    from main.surrogate import get_surrogate
+    if _scratch is None:
+        _scratch = tempfile.TemporaryDirectory(prefix="redox-bench-")
+    pH_values, T_values = _kernel_grid()
+    table = get_surrogate(PAIRS[1], directory=_scratch.name, speciation=True, ionic_strength=0.7, activity="davies")
+    table.deltaG(T_values, pH_values)
+    return KERNEL_POINTS
+
+
+@benchmark("coupling_480_pairs")
+def bench_coupling():
+    from main.coupling import couple_pairs
+    pairs = redox_pairs * 80
+    envs = environments * 10
+    couple_pairs(pairs, envs)
+    return len(pairs) ** 2 * len(envs)
+
+
+# === Optimization at increasing grid sizes ===
+
+def _optimize_benchmark(steps):
+    def run():
+        from optimize import optimize_environment_for_redox
+        for pair in redox_pairs:
+            optimize_environment_for_redox(pair, steps=steps)
+        return len(redox_pairs) * steps * steps
+    return run
+
+
+for _steps in OPTIMIZE_STEPS:
+    benchmark(f"optimize_steps_{_steps}", repeat=3, group="optimization")(_optimize_benchmark(_steps))
+
+
+@benchmark("efficiency_ties_1e6_points", repeat=3, group="optimization")
+def bench_efficiency_ties():
+    from optimize import efficiency_ties_for_redox
+    efficiency_ties_for_redox(redox_pairs[1], steps=100)
+    return 100 ** 3
+
+
+# === Sweep throughput ===
+
+# In-process only: the sweeps are 100 points per pair, far too little work for
+# a process pool to pay off, so a pool run would only time its startup
+@benchmark("sensitivity_sweeps", repeat=3, group="sweeps")
+def bench_sensitivity_sweeps():
+    import sensitivity
+    data_path = sensitivity.data_path
+    with tempfile.TemporaryDirectory() as tmp:
+        sensitivity.data_path = tmp
+        try:
+            sensitivity.run_sensitivity_analysis(render=False, workers=1)
+        finally:
+            sensitivity.data_path = data_path
+    return len(redox_pairs) * 100
+
+
+# === Kinetics: batched time-stepping to equilibrium (points = trajectories) ===
+
+@benchmark("kinetics_trajectories", repeat=3, group="kinetics")
+def bench_kinetics():
+    from main.kinetics import iter_kinetics
+    return sum(len(summary) for summary, _ in iter_kinetics())
+
+
+@benchmark("kinetics_trajectories_speciated", repeat=3, group="kinetics")
+def bench_kinetics_speciated():
+    from main.kinetics import iter_kinetics
+    return sum(len(summary) for summary, _ in iter_kinetics(speciation=True, activity="davies"))
+
+
+# === Local service: warm queries over HTTP on 127.0.0.1 ===
+
+SERVICE_REQUESTS = 200
+SERVICE_BATCH = 10_000
+
+
+@contextlib.contextmanager
+def _service():
+    """Runs main/service.py's server on an ephemeral port in a background thread; yields the port."""
+    import asyncio
+    import threading
+    from main import service
+
+    service.warm_up()
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(asyncio.start_server(service.handle_connection, "127.0.0.1", 0))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        yield server.sockets[0].getsockname()[1]
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        server.close()
+        loop.run_until_complete(server.wait_closed())
+        loop.close()
+
+
+def _post(connection, body):
+    connection.request("POST", "/evaluate", body=json.dumps(body), headers={"Content-Type": "application/json"})
+    response = connection.getresponse()
+    payload = json.loads(response.read())
+    if response.status != 200:
+        raise RuntimeError(payload["error"])
+    return payload
+
+
+@benchmark("service_small_requests", repeat=3, group="service")
+def bench_service_small():
+    # Sequential single-condition requests on one keep-alive connection (points = requests)
+    import http.client
+    with _service() as port:
+        connection = http.client.HTTPConnection("127.0.0.1", port)
+        for i in range(SERVICE_REQUESTS):
+            _post(connection, {"conditions": [{"pair": "CO2/CH4", "T": 300 + i % 50, "pH": 7.0}]})
+        connection.close()
+    return SERVICE_REQUESTS
+
+
+@benchmark("service_columns_10k", repeat=3, group="service")
+def bench_service_columns():
+    import http.client
+    pH_values, T_values = _kernel_grid()
+    names = [pair["name"] for pair in redox_pairs]
+    columns = {"pair": [names[i % len(names)] for i in range(SERVICE_BATCH)],
+               "T": T_values[:SERVICE_BATCH].tolist(), "pH": pH_values[:SERVICE_BATCH].tolist()}
+    with _service() as port:
+        connection = http.client.HTTPConnection("127.0.0.1", port)
+        _post(connection, {"columns": columns})
+        connection.close()
+    return SERVICE_BATCH
+
+
+# === Full pipelines (separate interpreter, scratch copy of the repo) ===
+
+def _pipeline_benchmark(script, flags):
+    def run():
+        with tempfile.TemporaryDirectory() as tmp:
+            for folder in ("main", "optimization", "sensitivity"):
+                shutil.copytree(os.path.join(root_dir, folder), os.path.join(tmp, folder),
+                                ignore=shutil.ignore_patterns("__pycache__", "figures_*", "data_sensitivity"))
+            args = [sys.executable, script, *flags]
+            proc = subprocess.run(args, cwd=tmp, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+            if proc.returncode != 0:
+                raise RuntimeError(f"{' '.join(args[1:])} failed:\n{proc.stderr[-2000:]}")
+    return run
+
+
+for _label, _script in PIPELINES:
+    benchmark(f"pipeline_{_label}_data", repeat=1, group="pipelines")(_pipeline_benchmark(_script, ["--no-plots"]))
+    benchmark(f"pipeline_{_label}_render", repeat=1, group="pipelines")(_pipeline_benchmark(_script, []))
+    benchmark(f"pipeline_{_label}_preview", repeat=1, group="pipelines")(_pipeline_benchmark(_script, ["--preview"]))
+
+
+# === Runner ===
+
+def run_benchmark(entry):
+    timings = []
+    points = None
+    for _ in range(entry["repeat"]):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            points = entry["fn"]()
+            timings.append(time.perf_counter() - start)
+    result = {
+        "group": entry["group"],
+        "repeat": entry["repeat"],
+        "min_s": min(timings),
+        "median_s": statistics.median(timings),
+    }
+    if points:
+        result["points"] = points
+        result["points_per_s"] = points / min(timings)
+    return result
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=root_dir,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current, baseline, threshold):
+    """Returns the benchmarks whose min time grew by more than threshold (fraction)."""
+    regressions = []
+    for name, result in current["benchmarks"].items():
+        previous = baseline["benchmarks"].get(name)
+        if previous is None or previous["min_s"] <= 0:
+            continue
+        ratio = result["min_s"] / previous["min_s"]
+        if ratio > 1 + threshold:
+            regressions.append((name, previous["min_s"], result["min_s"], ratio))
+    return regressions
+
+
+def run_all(selected):
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "benchmarks": {},
+    }
+    for entry in selected:
+        result = run_benchmark(entry)
+        report["benchmarks"][entry["name"]] = result
+        rate = f"{result['points_per_s']:>14,.0f} points/s" if "points_per_s" in result else ""
+        print(f"{entry['name']:<32} {result['min_s'] * 1000:10.2f} ms  {rate}")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark thermodynamic kernels and pipelines.")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--quick", action="store_true", help="skip full pipeline runs")
+    parser.add_argument("--output", help="result JSON path (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="earlier result JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="flag benchmarks slower than baseline by more than this fraction")
+    args = parser.parse_args()
+
+    selected = [b for b in BENCHMARKS
+                if args.filter in b["name"] and not (args.quick and b["group"] == "pipelines")]
+    report = run_all(selected)
+
+    output = args.output or os.path.join(results_dir, f"{report['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults saved to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ Slower than {args.compare} by more than {args.threshold:.0%}:")
+            for name, before, after, ratio in regressions:
+                print(f"  - {name}: {before * 1000:.2f} ms → {after * 1000:.2f} ms ({ratio:.2f}×)")
+            sys.exit(1)
+        print(f"\n✅ No regressions beyond {args.threshold:.0%} against {args.compare}")
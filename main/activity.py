@@ -0,0 +1,125 @@
+# activity.py
+# Optional activity-coefficient models for charged species.
+#
+# By default Q is built from molar concentrations (ideal solution). For the
+# saline ocean and vent environments this overstates the activity of ions such
+# as SO4²⁻ or Fe³⁺, so a Debye–Hückel-type correction can be switched on:
+#
+#   ideal          log γ = 0
+#   debye-huckel   log γ = −A z² √I                       (limiting law, I ≲ 0.005)
+#   extended       log γ = −A z² √I / (1 + B a √I)        (I ≲ 0.1)
+#   davies         log γ = −A z² (√I / (1 + √I) − 0.3 I)   (I ≲ 0.5)
+#
+# A(T) and B(T) follow from the dielectric constant of water; charges are stored
+# on each redox pair and the ionic strength I on each environment. H⁺ set from pH
+# is already an activity (pH = −log a_H⁺) and is not corrected again.
+#
+#   REDOX_ACTIVITY=davies python main/main.py     # enable for a whole run
+#   pair.deltaG(T, pH, I=0.7, activity="davies")  # or per call
+
+import os
+import math
+
+import numpy as np
+
+MODELS = ("ideal", "debye-huckel", "extended", "davies")
+MODEL = os.environ.get("REDOX_ACTIVITY", "ideal")
+if MODEL not in MODELS:
+    raise ValueError(f"REDOX_ACTIVITY must be one of {', '.join(MODELS)}, got {MODEL!r}")
+
+LN10 = math.log(10)
+
+# Largest accepted ionic strength (mol/L): seawater is ~0.7, and every model
+# here is already past its range of validity well before this
+MAX_IONIC_STRENGTH = 1.0
+
+# Ion size parameter a (Å) for the extended law (Kielland 1937); others use DEFAULT_ION_SIZE
+ION_SIZE = {
+    "H+": 9.0,
+    "Fe3+": 9.0,
+    "Fe2+": 6.0,
+    "SO4^2-": 4.0,
+    "CO3^2-": 4.5,
+    "HCO3-": 4.5,
+    "HS-": 3.5,
+    "CH3COO-": 4.5,
+    "NO3-": 3.0,
+    "NO2-": 3.0,
+}
+DEFAULT_ION_SIZE = 4.0
+
+# Σ ν ln γ per (model, ionic terms, I, T); bounded so long sweeps cannot grow it forever.
+# Grids with more distinct (I, T) than CACHE_KEYS (e.g. random samples) are computed directly.
+_cache = {}
+MAX_CACHE = 100_000
+CACHE_KEYS = 4096
+
+
+def dielectric_constant(T):
+    """Relative permittivity of water (Malmberg & Maryott 1956, 0–100 °C)."""
+    t = np.asarray(T, dtype=float) - 273.15
+    return 87.740 - 0.40008 * t + 9.398e-4 * t ** 2 - 1.410e-6 * t ** 3
+
+
+def debye_huckel_A(T):
+    """A (kg^½ mol^-½), ≈ 0.511 at 25 °C."""
+    T = np.asarray(T, dtype=float)
+    return 1.82483e6 / (dielectric_constant(T) * T) ** 1.5
+
+
+def debye_huckel_B(T):
+    """B (Å⁻¹ kg^½ mol^-½), ≈ 0.329 at 25 °C."""
+    T = np.asarray(T, dtype=float)
+    return 50.2916 / np.sqrt(dielectric_constant(T) * T)
+
+
+def log10_gamma(z, I, T, model=None, a=DEFAULT_ION_SIZE):
+    """log₁₀ γ for charge z at ionic strength I (mol/L) and T (K); broadcasts over all inputs."""
+    model = MODEL if model is None else model
+    z2 = np.asarray(z, dtype=float) ** 2
+    sqrt_I = np.sqrt(np.asarray(I, dtype=float))
+    if model == "ideal":
+        return np.zeros(np.broadcast_shapes(z2.shape, sqrt_I.shape, np.shape(T)))
+    A = debye_huckel_A(T)
+    if model == "debye-huckel":
+        return -A * z2 * sqrt_I
+    if model == "extended":
+        return -A * z2 * sqrt_I / (1 + debye_huckel_B(T) * np.asarray(a, dtype=float) * sqrt_I)
+    if model == "davies":
+        return -A * z2 * (sqrt_I / (1 + sqrt_I) - 0.3 * sqrt_I ** 2)
+    raise ValueError(f"Unknown activity model {model!r}; expected one of {', '.join(MODELS)}")
+
+
+def ln_gamma_sum(terms, I, T, model=None):
+    """
+    Σ ν ln γ over terms = ((ν, z, a), ...), the correction a pair adds to ln Q.
+
+    Values are cached per distinct (I, T): a sweep over an environment grid only
+    evaluates each combination once, and repeated sweeps reuse the cache.
+    """
+    model = MODEL if model is None else model
+    if model == "ideal" or not terms:
+        return 0.0
+    I, T = np.broadcast_arrays(np.asarray(I, dtype=float), np.asarray(T, dtype=float))
+    keys, inverse = np.unique((I + 1j * T).ravel(), return_inverse=True)
+    nu, z, a = (np.array(column, dtype=float)[:, None] for column in zip(*terms))
+    if len(keys) > CACHE_KEYS:
+        values = LN10 * (nu * log10_gamma(z, keys.real, keys.imag, model, a)).sum(axis=0)
+        return values[inverse].reshape(I.shape)
+
+    missing = [key for key in keys if (model, terms, key) not in _cache]
+    if missing:
+        if len(_cache) + len(missing) > MAX_CACHE:
+            _cache.clear()
+        missing = np.array(missing)
+        values = LN10 * (nu * log10_gamma(z, missing.real, missing.imag, model, a)).sum(axis=0)
+        _cache.update(((model, terms, key), value) for key, value in zip(missing, values))
+
+    values = np.array([_cache[(model, terms, key)] for key in keys])
+    return values[inverse].reshape(I.shape)
+
+
+if __name__ == "__main__":
+    for model in MODELS:
+        gammas = [10 ** float(log10_gamma(z, 0.7, 343.15, model, 4.0)) for z in (1, 2, 3)]
+        print(f"{model:<13} γ(z=1, 2, 3) at I = 0.7, 70 °C: " + ", ".join(f"{g:.3f}" for g in gammas))
@@ -0,0 +1,167 @@
+# artifacts.py
+# Single place where figures and tables are written to disk, so every plotting
+# module saves its PNG preview and PDF report copy the same way.
+#
+# Figures are drawn on the calling thread (matplotlib figures are not
+# thread-safe): the PDF is rendered to bytes there and the PNG is rasterized to
+# an RGBA buffer. PNG compression and every file write then run on a small
+# background thread pool, so the compute thread can move on to the next figure.
+# The pending queue is bounded (submitting blocks when it is full) and flush()
+# is the barrier that guarantees every file is complete.
+#
+#   REDOX_IO_WORKERS=0   write synchronously on the calling thread
+#   REDOX_IO_WORKERS=n   use n writer threads
+# The default leaves one core to the compute thread (up to 4 writers); on a
+# single core there is nothing to overlap with, so writes stay synchronous.
+#
+# The render profile decides what save_figure produces, for every plotting module:
+#   REDOX_RENDER=publication   300 dpi PNG preview + vector PDF for the report (default)
+#   REDOX_RENDER=preview       72 dpi PNG only, drawn entirely by the raster backend;
+#                              report PDFs are left as they are
+# Scripts also accept --preview, which calls set_render_profile("preview").
+
+import io
+import os
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import numpy as np
+
+from main.instrumentation import stage, timed_write
+
+# PDFs carry no creation date, so unchanged figures re-render to identical bytes
+PDF_METADATA = {"CreationDate": None}
+
+RENDER_PROFILES = {
+    "publication": {"dpi": 300, "pdf": True},
+    "preview": {"dpi": 72, "pdf": False},
+}
+RENDER_PROFILE = os.environ.get("REDOX_RENDER", "publication")
+if RENDER_PROFILE not in RENDER_PROFILES:
+    raise ValueError(f"REDOX_RENDER must be one of {', '.join(RENDER_PROFILES)}, got {RENDER_PROFILE!r}")
+
+IO_WORKERS = int(os.environ.get("REDOX_IO_WORKERS", min(4, (os.cpu_count() or 1) - 1)))
+MAX_PENDING = 2 * max(IO_WORKERS, 1)
+
+_executor = None
+_slots = threading.BoundedSemaphore(MAX_PENDING)
+_pending = set()
+_pending_lock = threading.Lock()
+
+
+def _finished(future):
+    _slots.release()
+
+
+def submit(fn, *args, **kwargs):
+    """Runs fn on the writer pool, blocking while MAX_PENDING writes are already queued."""
+    global _executor
+    if IO_WORKERS <= 0:
+        fn(*args, **kwargs)
+        return
+
+    _slots.acquire()
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="redox-io")
+    future = _executor.submit(fn, *args, **kwargs)
+    with _pending_lock:
+        _pending.add(future)
+    future.add_done_callback(_finished)
+
+
+def flush():
+    """Waits until every queued figure and table is on disk; re-raises the first write error."""
+    errors = []
+    while True:
+        # Writes queued while we wait are picked up by the next round
+        with _pending_lock:
+            pending = list(_pending)
+        if not pending:
+            break
+        wait(pending)
+        with _pending_lock:
+            _pending.difference_update(pending)
+        errors.extend(f.exception() for f in pending if f.exception() is not None)
+    if errors:
+        raise errors[0]
+
+
+atexit.register(flush)
+
+
+def set_render_profile(name):
+    """Switches every later save_figure call to a profile in RENDER_PROFILES."""
+    global RENDER_PROFILE
+    if name not in RENDER_PROFILES:
+        raise ValueError(f"Unknown render profile {name!r}; expected one of {', '.join(RENDER_PROFILES)}")
+    RENDER_PROFILE = name
+
+
+def _render(fig, fmt, stem, **savefig_kwargs):
+    with stage(f"savefig {fmt} {stem}"):
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=fmt, **savefig_kwargs)
+        return buffer.getvalue()
+
+
+def _rasterize(fig, stem, dpi):
+    # Same drawing as savefig(format="png"), minus the PNG compression
+    data = _render(fig, "rgba", stem, dpi=dpi)
+    width, height = (int(v) for v in fig.get_size_inches() * dpi)
+    if len(data) != 4 * width * height:
+        return None
+    return np.frombuffer(data, dtype=np.uint8).reshape(height, width, 4)
+
+
+def _write_bytes(path, data):
+    with timed_write(path):
+        with open(path, "wb") as f:
+            f.write(data)
+
+
+def _write_png(path, rgba, dpi):
+    from matplotlib.image import imsave
+
+    # What the Agg backend does after drawing, so the bytes match savefig's
+    with timed_write(path):
+        imsave(path, rgba, format="png", origin="upper", dpi=dpi)
+
+
+def save_figure(png_path, pdf_path, fig=None, dpi=None, **savefig_kwargs):
+    """
+    Saves a figure (default: the current pyplot figure) as PNG preview and PDF,
+    as the render profile dictates (dpi defaults to the profile's).
+
+    Both formats are drawn here, on the calling thread; PNG compression and the
+    file writes are queued. The figure is closed, so the caller can start the
+    next one.
+    """
+    import matplotlib.pyplot as plt
+
+    if fig is None:
+        fig = plt.gcf()
+    profile = RENDER_PROFILES[RENDER_PROFILE]
+    dpi = profile["dpi"] if dpi is None else dpi
+    stem = os.path.splitext(os.path.basename(png_path))[0]
+    metadata = {**PDF_METADATA, **savefig_kwargs.pop("metadata", {})}
+    if profile["pdf"]:
+        submit(_write_bytes, pdf_path, _render(fig, "pdf", stem, metadata=metadata, **savefig_kwargs))
+    rgba = None if savefig_kwargs else _rasterize(fig, stem, dpi)
+    if rgba is None:
+        # Extra savefig options (bbox_inches, ...) or an unexpected buffer size
+        submit(_write_bytes, png_path, _render(fig, "png", stem, dpi=dpi, **savefig_kwargs))
+    else:
+        submit(_write_png, png_path, rgba, dpi)
+    plt.close(fig)
+
+
+def _write_text(path, text):
+    with timed_write(path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+def write_text(path, text):
+    """Queues a complete text file (e.g. a LaTeX table) for writing."""
+    submit(_write_text, path, text)
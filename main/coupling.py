@@ -0,0 +1,123 @@
+# coupling.py
+# Combines half-reactions into full redox reactions (electron donor × electron acceptor)
+# and evaluates ΔG for every combination in every environment at once.
+#
+# Each pair in data.py is written as a reduction (ox + ne⁻ → red). Coupling an
+# acceptor A with a donor D gives
+#     ox_A + red_D → red_A + ox_D,   balanced to L = lcm(n_A, n_D) electrons,
+#     ΔG = −L·F·(E_A − E_D),
+# with E_A and E_D the Nernst-adjusted potentials in the given environment.
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+if __name__ == "__main__":  # run as a script: resolve main.* from the repo root, not from main/ itself
+    sys.path[0] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+from main.thermodynamics import F
+from main.data import redox_pairs, environments
+from main.records import as_pair
+from main.instrumentation import timed, count
+
+
+def half_cell_potentials(pairs, envs):
+    """Nernst-adjusted E (V) for every pair in every environment, shape (pairs, envs)."""
+    pH = np.array([env["pH"] for env in envs], dtype=float)
+    T = np.array([env["T"] for env in envs], dtype=float)
+    I = np.array([env.get("ionic_strength", 0.0) for env in envs], dtype=float)
+    E = np.empty((len(pairs), len(envs)))
+    for i, pair in enumerate(pairs):
+        E[i] = as_pair(pair).E(T, pH, I=I)
+    return E
+
+
+def oxidized_species(pair):
+    reactants = [s for s in pair["reactants"] if s != "H+"]
+    return reactants[0] if reactants else next(iter(pair["reactants"]))
+
+
+def reduced_species(pair):
+    return next(iter(pair["products"]))
+
+
+@timed()
+def couple_pairs(pairs=None, envs=None, prune=True):
+    """
+    Evaluates ΔG for all acceptor × donor × environment combinations.
+
+    Candidates are pruned before ΔG is computed: a combination can only be
+    exergonic somewhere if the acceptor's highest potential exceeds the
+    donor's lowest one across environments. Self-couplings are always dropped.
+
+    Returns a dict with the candidate index arrays ("acceptor", "donor"),
+    the electron count "n" (lcm of both half-reactions), "dE" and "dG"
+    (kJ/mol) arrays of shape (candidates, envs) and a boolean "feasible"
+    mask (ΔG < 0). With prune=False every ordered combination is kept.
+    """
+    pairs = redox_pairs if pairs is None else pairs
+    envs = environments if envs is None else envs
+
+    E = half_cell_potentials(pairs, envs)
+    n = np.array([pair["n"] for pair in pairs], dtype=np.int64)
+
+    candidates = ~np.eye(len(pairs), dtype=bool)
+    if prune:
+        candidates &= E.max(axis=1)[:, None] > E.min(axis=1)[None, :]
+    acc, don = np.nonzero(candidates)
+
+    n_lcm = np.lcm(n[acc], n[don])
+    dE = E[acc] - E[don]
+    dG = -n_lcm[:, None] * F * dE / 1000
+    count("couple_pairs", dG.size)
+
+    return {
+        "pairs": [pair["name"] for pair in pairs],
+        "environments": [env["name"] for env in envs],
+        "acceptor": acc,
+        "donor": don,
+        "n": n_lcm,
+        "dE": dE,
+        "dG": dG,
+        "feasible": dG < 0,
+    }
+
+
+def dense_deltaG(result):
+    """Expands a couple_pairs result to a (acceptor, donor, env) ΔG tensor; pruned entries are NaN."""
+    size = len(result["pairs"])
+    tensor = np.full((size, size, len(result["environments"])), np.nan)
+    tensor[result["acceptor"], result["donor"]] = result["dG"]
+    return tensor
+
+
+def coupling_table(result, pairs=None, feasible_only=True):
+    """Flattens a couple_pairs result into one row per (acceptor, donor, environment)."""
+    pairs = redox_pairs if pairs is None else pairs
+
+    k, e = np.nonzero(result["feasible"]) if feasible_only else np.indices(result["dG"].shape).reshape(2, -1)
+    acc = result["acceptor"][k]
+    don = result["donor"][k]
+
+    oxidants = np.array([oxidized_species(p) for p in pairs], dtype=object)
+    reductants = np.array([reduced_species(p) for p in pairs], dtype=object)
+    names = np.array(result["pairs"], dtype=object)
+
+    df = pd.DataFrame({
+        "Acceptor": names[acc],
+        "Donor": names[don],
+        "Reaction": oxidants[acc] + " + " + reductants[don],
+        "Environment": np.array(result["environments"], dtype=object)[e],
+        "n (e-)": result["n"][k],
+        "ΔE (V)": np.round(result["dE"][k, e], 4),
+        "ΔG (kJ/mol)": np.round(result["dG"][k, e], 2),
+    })
+    return df.sort_values(["Environment", "ΔG (kJ/mol)"], ignore_index=True)
+
+
+if __name__ == "__main__":
+    result = couple_pairs()
+    df = coupling_table(result)
+    print(df.to_string(index=False))
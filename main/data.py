@@ -3,6 +3,7 @@
 # It also ensures that the figures directory exists before saving the plots.
 
 # Redox pairs (12 total) with standard potentials, stoichiometry, concentrations, and ΔH
+# "charges" lists the charged species (used by the optional activity model); others are neutral
 redox_pairs = [
     {
         "name": "H2/H+",
@@ -12,7 +13,8 @@ redox_pairs = [
         "delta_H": 0.000,  # kJ/mol
         "reactants": {"H+": 2},
         "products": {"H2": 1},
-        "conc": {"H+": 1e-7, "H2": 1e-6}
+        "conc": {"H+": 1e-7, "H2": 1e-6},
+        "charges": {"H+": 1}
     },
     {
         "name": "CO2/CH4",
@@ -22,7 +24,8 @@ redox_pairs = [
         "delta_H": -44.5,  # kJ/mol (approx. combustion of CH4)
         "reactants": {"CO2": 1, "H+": 8},
         "products": {"CH4": 1},
-        "conc": {"CO2": 1e-3, "CH4": 1e-6, "H+": 1e-7}
+        "conc": {"CO2": 1e-3, "CH4": 1e-6, "H+": 1e-7},
+        "charges": {"H+": 1}
     },
     {
         "name": "NO3-/NO2-",
@@ -32,7 +35,8 @@ redox_pairs = [
         "delta_H": -90.53,  # estimated
         "reactants": {"NO3-": 1, "H+": 2},
         "products": {"NO2-": 1},
-        "conc": {"NO3-": 1e-4, "NO2-": 1e-6, "H+": 1e-7}
+        "conc": {"NO3-": 1e-4, "NO2-": 1e-6, "H+": 1e-7},
+        "charges": {"NO3-": -1, "NO2-": -1, "H+": 1}
     },
     {
         "name": "SO4^2-/H2S",
@@ -42,7 +46,8 @@ redox_pairs = [
         "delta_H": 105.87,  # Approximate enthalpy for sulfate reduction
         "reactants": {"SO4^2-": 1, "H+": 10},
         "products": {"H2S": 1, "H2O": 4},
-        "conc": {"SO4^2-": 1e-3, "H2S": 1e-6, "H+": 1e-7}
+        "conc": {"SO4^2-": 1e-3, "H2S": 1e-6, "H+": 1e-7},
+        "charges": {"SO4^2-": -2, "H+": 1}
     },
     {
         "name": "Fe3+/Fe2+",
@@ -52,7 +57,8 @@ redox_pairs = [
         "delta_H": -40.2,  # Approximate ΔH in kJ/mol, literature varies from -18 to -20
         "reactants": {"Fe3+": 1},
         "products": {"Fe2+": 1},
-        "conc": {"Fe3+": 1e-6, "Fe2+": 1e-6}
+        "conc": {"Fe3+": 1e-6, "Fe2+": 1e-6},
+        "charges": {"Fe3+": 3, "Fe2+": 2}
     },
     {
         "name": "CO2/CH3COO-",
@@ -62,15 +68,18 @@ redox_pairs = [
         "delta_H": -45.27,  # Approximate enthalpy for CO₂ reduction to acetate
         "reactants": {"CO2": 2, "H+": 8},
         "products": {"CH3COO-": 1, "H2O": 2},
-        "conc": {"CO2": 1e-3, "CH3COO-": 1e-4, "H+": 1e-7}
+        "conc": {"CO2": 1e-3, "CH3COO-": 1e-4, "H+": 1e-7},
+        "charges": {"CH3COO-": -1, "H+": 1}
    } 
 ]
 
 
 
 # Environment definitions
+# ionic_strength (mol/L) is only used by the optional activity model (see activity.py):
+# vent fluid and ocean are seawater-like, the pond is dilute freshwater
 environments = [
-    {"name": "alkaline_vent", "pH": 9, "T": 343.15},
-    {"name": "acidic_ocean", "pH": 5.5, "T": 313.15},
-    {"name": "shallow_pond", "pH": 7, "T": 323.15}
+    {"name": "alkaline_vent", "pH": 9, "T": 343.15, "ionic_strength": 0.7},
+    {"name": "acidic_ocean", "pH": 5.5, "T": 313.15, "ionic_strength": 0.7},
+    {"name": "shallow_pond", "pH": 7, "T": 323.15, "ionic_strength": 0.01}
 ]
\ No newline at end of file
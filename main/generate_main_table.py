@@ -1,54 +1,64 @@
 import os
+import sys
 import pandas as pd
 
-def tex_escape(s):
-    return str(s).replace("_", "\\_")
-
-def format_redox_pair(name):
-    return {
-        "CO2/CH3COO-": r"CO$_2$/CH$_3$COO$^-$",
-        "CO2/CH4": r"CO$_2$/CH$_4$",
-        "Fe3+/Fe2+": r"Fe$^{3+}$/Fe$^{2+}$",
-        "H2/H+": r"H$_2$/H$^+$",
-        "NO3-/NO2-": r"NO$_3^-$/NO$_2^-$",
-        "SO42-/H2S": r"SO$_4^{2-}$/H$_2$S"
-    }.get(name, tex_escape(name))
-
-def format_environment(env):
-    return {
-        "acidicocean": r"\textit{acidic ocean}",
-        "alkalinevent": r"\textit{alkaline vent}",
-        "shallowpond": r"\textit{shallow pond}"
-    }.get(env, tex_escape(env))
-
-def generate_latex_table():
-    csv_path = "main/results.csv"
-    tex_path = "report/tables/table_main_results.tex"
-    os.makedirs(os.path.dirname(tex_path), exist_ok=True)
-
-    df = pd.read_csv(csv_path)
-    df = df.sort_values(by=["Environment", "Redox Pair"])
-
-    with open(tex_path, "w") as f:
-        f.write(r"""\begin{tabular}{l l S[table-format=-1.3] S[table-format=-4.2] S[table-format=-4.0] S[table-format=-4.0]}
-\toprule
-Redox Pair & Environment & {E (V)} & {$\Delta G$ (kJ/mol)} & {ExG (\%)} & {ExH (\%)} \\
-\midrule
-""")
-        for _, row in df.iterrows():
-            f.write(
-                f"{format_redox_pair(row['Redox Pair'])} & "
-                f"{format_environment(row['Environment'])} & "
-                f"{row['E (V)']:.3f} & "
-                f"{row['ΔG (kJ/mol)']:.2f} & "
-                f"{row['Exergy Eff (ΔG%)']:.0f} & "
-                f"{row['Exergy Eff (ΔH%)']:.0f} \\\\ \n"
-            )
-
-        f.write(r"\bottomrule" + "\n")
-        f.write(r"\end{tabular}" + "\n")
-
-    print(f"✅ LaTeX table written to {tex_path}")
+if __name__ == "__main__":  # run as a script: resolve main.* from the repo root, not from main/ itself
+    sys.path[0] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+from main.table_export import tex_escape, write_latex_table
+from main.instrumentation import timed
+
+base_dir = os.path.dirname(__file__)
+csv_path = os.path.join(base_dir, "results.csv")
+tex_path = os.path.join(base_dir, "../report/tables/table_main_results.tex")
+
+REDOX_PAIR_TEX = {
+    "CO2/CH3COO-": r"CO$_2$/CH$_3$COO$^-$",
+    "CO2/CH4": r"CO$_2$/CH$_4$",
+    "Fe3+/Fe2+": r"Fe$^{3+}$/Fe$^{2+}$",
+    "H2/H+": r"H$_2$/H$^+$",
+    "NO3-/NO2-": r"NO$_3^-$/NO$_2^-$",
+    "SO42-/H2S": r"SO$_4^{2-}$/H$_2$S"
+}
+
+ENVIRONMENT_TEX = {
+    "acidicocean": r"\textit{acidic ocean}",
+    "alkalinevent": r"\textit{alkaline vent}",
+    "shallowpond": r"\textit{shallow pond}"
+}
+
+def format_redox_pair(names):
+    return names.map(REDOX_PAIR_TEX).fillna(tex_escape(names))
+
+def format_environment(envs):
+    return envs.map(ENVIRONMENT_TEX).fillna(tex_escape(envs))
+
+COLUMNS = [
+    ("Redox Pair", format_redox_pair),
+    ("Environment", format_environment),
+    ("E (V)", "%.3f"),
+    ("ΔG (kJ/mol)", "%.2f"),
+    ("Exergy Eff (ΔG%)", "%.0f"),
+    ("Exergy Eff (ΔH%)", "%.0f"),
+]
+
+@timed("generate_main_table")
+def generate_latex_table(csv_path=csv_path, tex_path=tex_path, longtable=False, rows_per_file=None, chunksize=None):
+    # chunksize streams the CSV instead of loading it; rows then keep file order
+    if chunksize is None:
+        data = pd.read_csv(csv_path).sort_values(by=["Environment", "Redox Pair"])
+    else:
+        data = pd.read_csv(csv_path, chunksize=chunksize)
+
+    written = write_latex_table(
+        data, tex_path, COLUMNS,
+        col_spec="l l S[table-format=-1.3] S[table-format=-4.2] S[table-format=-4.0] S[table-format=-4.0]",
+        header="Redox Pair & Environment & {E (V)} & {$\\Delta G$ (kJ/mol)} & {ExG (\\%)} & {ExH (\\%)} \\\\\n",
+        longtable=longtable,
+        rows_per_file=rows_per_file,
+    )
+
+    print(f"✅ LaTeX table written to {', '.join(written)}")
 
 if __name__ == "__main__":
-    generate_latex_table()
\ No newline at end of file
+    generate_latex_table()
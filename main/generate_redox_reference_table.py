@@ -4,38 +4,39 @@
 
 import os
 import sys
-# if this script lives in, say, main/scripts/, and your data.py is in main/,
-# this will let you do `from data import redox_pairs`
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from data import redox_pairs
+if __name__ == "__main__":  # run as a script: resolve main.* from the repo root, not from main/ itself
+    sys.path[0] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-def generate_redox_reference_table():
-    output_path = "report/tables/table_redox_reference.tex"
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+from main.data import redox_pairs
+from main.instrumentation import timed
+from main.table_export import table_head, table_foot
+from main.artifacts import write_text
 
-    with open(output_path, "w") as f:
-        f.write("\\begin{tabular}{l l c r r}\n")
-        f.write("\\toprule\n")
-        f.write("Redox Pair & Reaction & $n$ & $E^0$ (V) & $\\Delta H$ (kJ/mol) \\\\\n")
-        f.write("\\midrule\n")
+base_dir = os.path.dirname(__file__)
+tex_path = os.path.join(base_dir, "../report/tables/table_redox_reference.tex")
 
-        for pair in redox_pairs:
-            name     = pair.get("name", "N/A")
-            reaction = pair.get("reaction", "N/A")
-            n        = pair.get("n", "")
-            E0       = pair.get("E0", "")
-            delta_H  = pair.get("delta_H", "")
+@timed()
+def generate_redox_reference_table(tex_path=tex_path):
+    rows = []
+    for pair in redox_pairs:
+        name     = pair.get("name", "N/A")
+        reaction = pair.get("reaction", "N/A")
+        n        = pair.get("n", "")
+        E0       = pair.get("E0", "")
+        delta_H  = pair.get("delta_H", "")
 
-            # escape any underscores in LaTeX
-            reaction = reaction.replace("_", "\\_")
+        # escape any underscores in LaTeX
+        reaction = reaction.replace("_", "\\_")
 
-            f.write(f"{name} & {reaction} & {n} & {E0} & {delta_H} \\\\\n")
+        rows.append(f"{name} & {reaction} & {n} & {E0} & {delta_H} \\\\\n")
 
-        f.write("\\bottomrule\n")
-        f.write("\\end{tabular}\n")
+    # Queued on the background writer like the other tables (see artifacts.flush)
+    os.makedirs(os.path.dirname(os.path.abspath(tex_path)), exist_ok=True)
+    header = "Redox Pair & Reaction & $n$ & $E^0$ (V) & $\\Delta H$ (kJ/mol) \\\\\n"
+    write_text(tex_path, table_head("l l c r r", header) + "".join(rows) + table_foot())
 
-    print(f"Redox reference LaTeX table written to {output_path}")
+    print(f"Redox reference LaTeX table written to {tex_path}")
 
 if __name__ == "__main__":
-    generate_redox_reference_table()
\ No newline at end of file
+    generate_redox_reference_table()
@@ -0,0 +1,128 @@
+# instrumentation.py
+# Opt-in timing and counting for the pipeline stages.
+#
+#   REDOX_PROFILE=1 python sensitivity/sensitivity.py          # per-stage report at exit
+#   REDOX_CPROFILE=run.prof python optimization/optimize.py    # also dump cProfile stats
+#
+# When neither variable is set, `timed` returns the function unchanged and
+# `stage`/`timed_write` return a shared no-op context, so disabled runs pay nothing.
+
+import os
+import sys
+import time
+import atexit
+import threading
+import functools
+import contextlib
+
+CPROFILE_PATH = os.environ.get("REDOX_CPROFILE") or None
+ENABLED = os.environ.get("REDOX_PROFILE", "") not in ("", "0") or CPROFILE_PATH is not None
+
+_NULL = contextlib.nullcontext()
+
+# stage name -> {"calls", "seconds", "evaluations", "bytes", "files"}
+stats = {}
+_lock = threading.Lock()  # file writes are also timed from the artifact writer threads
+
+
+def _entry(name):
+    entry = stats.get(name)
+    if entry is None:
+        entry = stats[name] = {"calls": 0, "seconds": 0.0, "evaluations": 0, "bytes": 0, "files": 0}
+    return entry
+
+
+@contextlib.contextmanager
+def _timer(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        with _lock:
+            entry = _entry(name)
+            entry["calls"] += 1
+            entry["seconds"] += elapsed
+
+
+def stage(name):
+    """Context manager timing a block under `name`."""
+    return _timer(name) if ENABLED else _NULL
+
+
+def timed(name=None):
+    """Decorator timing every call of a function (under its own name by default)."""
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _timer(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def count(name, evaluations):
+    """Adds thermodynamic evaluations to a stage, used for points/s."""
+    if ENABLED:
+        with _lock:
+            _entry(name)["evaluations"] += evaluations
+
+
+def record_file(name, path):
+    """Adds a written file and its size to a stage."""
+    if ENABLED:
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        with _lock:
+            entry = _entry(name)
+            entry["files"] += 1
+            entry["bytes"] += size
+
+
+@contextlib.contextmanager
+def _write_timer(path, name):
+    with _timer(name):
+        yield
+    record_file(name, path)
+
+
+def timed_write(path, name=None):
+    """Context manager around a file write; records time, file count and bytes written."""
+    if not ENABLED:
+        return _NULL
+    return _write_timer(path, name or f"write {os.path.splitext(path)[1].lstrip('.') or 'file'}")
+
+
+def report(file=None):
+    file = file or sys.stderr
+    if not stats:
+        return
+    print("\n⏱️ Stage timings", file=file)
+    print(f"{'stage':<44}{'calls':>7}{'total s':>10}{'evals':>12}{'points/s':>14}{'files':>7}{'MB':>9}", file=file)
+    for name, entry in sorted(stats.items(), key=lambda item: -item[1]["seconds"]):
+        rate = entry["evaluations"] / entry["seconds"] if entry["evaluations"] and entry["seconds"] else 0
+        evals = entry["evaluations"] or ""
+        rate = f"{rate:,.0f}" if rate else ""
+        files = entry["files"] or ""
+        size = f"{entry['bytes'] / 1e6:.2f}" if entry["bytes"] else ""
+        print(f"{name[:43]:<44}{entry['calls']:>7}{entry['seconds']:>10.3f}{evals:>12}{rate:>14}{files:>7}{size:>9}",
+              file=file)
+
+
+if ENABLED:
+    atexit.register(report)
+
+if CPROFILE_PATH is not None:
+    import cProfile
+
+    _profiler = cProfile.Profile()
+    _profiler.enable()
+
+    @atexit.register
+    def _dump_profile():
+        _profiler.disable()
+        _profiler.dump_stats(CPROFILE_PATH)
+        print(f"cProfile stats written to {CPROFILE_PATH}", file=sys.stderr)
@@ -0,0 +1,306 @@
+# kinetics.py
+# Time evolution of ΔG as reactions run toward equilibrium.
+#
+# Everywhere else Q is a snapshot at fixed concentrations. Here each trajectory
+# starts from a pair's stored concentrations (reactants other than H⁺ scaled by
+# 10^log_c, as in optimize.py --ties) in one environment and advances the
+# reaction extent ξ (mol/L): every species with a stored concentration follows
+# c = c₀ + ν ξ. [H⁺] stays at the environment pH (buffered), and species
+# without a stored concentration (H₂O) keep unit activity. Half-reactions run
+# as written against the SHE, as in the rest of the project.
+#
+# Net rate: r = k · tanh(−ΔG / 2RT), i.e. forward minus backward flux with the
+# thermodynamic driving force. The reaction runs forward while ΔG < 0, backward
+# while ΔG > 0, saturates at ±k far from equilibrium, and slows linearly close to it.
+#
+# Every trajectory takes its own explicit steps in ξ. A step is the smaller of
+# MAX_CHANGE of the limiting consumed species and HALFWAY to equilibrium on the
+# linearized ΔG(ξ), so there is no overshoot, and dt = |Δξ| / |r|. A trajectory
+# stops once |ΔG| ≤ tol (equilibrium), a consumed species falls below DEPLETION of
+# its initial value, or t reaches t_end. Finished trajectories are dropped from
+# the active set, so late steps only evaluate the ones still running.
+# Trajectories are processed CHUNK at a time; working memory is
+# O(CHUNK × species) however many there are.
+#
+#   python main/kinetics.py [--no-plots] [--log-c-steps 401] [--rate 1e-9] [--t-end 3.15e7]
+#   integrate(pair, T, pH, conc0)    # one batch of trajectories for a single pair
+
+import os
+import sys
+import argparse
+
+import numpy as np
+import pandas as pd
+
+if __name__ == "__main__":  # run as a script: resolve main.* from the repo root, not from main/ itself
+    sys.path[0] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+from main.thermodynamics import R
+from main.records import PAIRS, ENVIRONMENTS, as_pair, as_environment
+from main.instrumentation import timed, count, stage, record_file, timed_write
+
+base_dir = os.path.dirname(__file__)
+results_path = os.path.join(base_dir, "kinetics_results.csv")
+profiles_path = os.path.join(base_dir, "kinetics_profiles.csv")
+
+RATE = 1e-9                # k, mol/(L·s)
+T_END = 3.15e7             # s (one year)
+TOL = 1.0                  # J/mol
+MAX_CHANGE = 0.1           # largest relative decrease of a consumed species per step
+HALFWAY = 0.5              # largest fraction of the (linearized) distance to equilibrium per step
+DEPLETION = 1e-9           # consumed species below this fraction of c₀ count as used up
+MAX_STEPS = 10_000
+CHUNK = 4096
+LOG_C = np.linspace(-3.0, 1.0, 401)
+PROFILE_SAMPLES = 36       # log-spaced ΔG(t) samples from 1 s to t_end
+
+STATUS = ("running", "equilibrium", "depleted", "t_end", "max_steps")
+RUNNING, EQUILIBRIUM, DEPLETED, T_END_REACHED, MAX_STEPS_REACHED = range(len(STATUS))
+
+
+def tracked_species(pair):
+    """Species whose concentration changes with ξ: stored concentration, nonzero ν, not the buffered H⁺."""
+    return [species for species, coeff in pair.stoich.items()
+            if coeff and species in pair.conc and species != "H+"]
+
+
+def profile_times(t_end=T_END, samples=PROFILE_SAMPLES):
+    """Log-spaced sample times (s) up to t_end, from 1 s (or t_end if shorter)."""
+    return np.logspace(np.log10(min(1.0, t_end)), np.log10(t_end), samples)
+
+
+def pair_log_c(pair, log_c):
+    """
+    The log c shifts worth integrating for pair: all of them if a tracked
+    reactant is scaled, else only the one nearest 0 (e.g. H₂/H⁺, whose only
+    reactant is the buffered H⁺, would repeat the same trajectory).
+    """
+    if any(species in pair.reactants for species in tracked_species(pair)):
+        return log_c
+    return log_c[[np.argmin(np.abs(log_c))]]
+
+
+def initial_conc(pair, log_c):
+    """Stored concentrations with every reactant except H⁺ scaled by 10^log_c."""
+    scale = 10.0 ** np.asarray(log_c, dtype=float)
+    return {species: pair.conc[species] * scale if species in pair.reactants else np.full(scale.shape, pair.conc[species])
+            for species in tracked_species(pair)}
+
+
+@timed()
+def integrate(pair, T, pH, conc0, I=None, rate=RATE, t_end=T_END, tol=TOL, times=(),
+              max_steps=MAX_STEPS, speciation=None, activity=None):
+    """
+    Integrates one batch of trajectories of a single pair.
+
+    T, pH, I, rate and each conc0[species] broadcast to one value per
+    trajectory; species missing from conc0 start at the stored value. Returns
+    a dict of arrays: dG_start and dG (J/mol), extent (mol/L), t (s), steps,
+    status (index into STATUS), conc (final, per species) and profile, ΔG
+    interpolated at each of times (NaN past the end of a trajectory that did
+    not settle).
+    """
+    pair = as_pair(pair)
+    species = tracked_species(pair)
+    if not species:
+        raise ValueError(f"{pair.name}: no species concentration changes with the reaction extent")
+    shape = np.broadcast_shapes(np.shape(T), np.shape(pH), np.shape(I), np.shape(rate),
+                                *(np.shape(conc0.get(s, 0.0)) for s in species))
+    n = int(np.prod(shape))
+
+    def flat(values):
+        return np.broadcast_to(np.asarray(values, dtype=float), shape).reshape(n)
+
+    T, pH, rate = flat(T), flat(pH), flat(rate)
+    I = None if I is None else flat(I)
+    nu = np.array([pair.stoich[s] for s in species], dtype=float)[:, None]
+    c0 = np.stack([flat(conc0.get(s, pair.conc[s])) for s in species])
+    times = np.asarray(times, dtype=float)
+
+    def deltaG(rows, extent):
+        conc = dict(zip(species, c0[:, rows] + nu * extent))
+        count("integrate", len(rows))
+        return pair.deltaG(T[rows], pH[rows], conc, speciation=speciation,
+                           I=None if I is None else I[rows], activity=activity)
+
+    extent = np.zeros(n)
+    t = np.zeros(n)
+    steps = np.zeros(n, dtype=np.int64)
+    status = np.full(n, RUNNING, dtype=np.int8)
+    dG_start = deltaG(np.arange(n), extent)
+    dG = dG_start.copy()
+    profile = np.full((n, len(times)), np.nan)
+    profile[:, times <= 0] = dG_start[:, None]
+    recorded = np.full(n, np.searchsorted(times, 0.0, side="right"))
+
+    active = np.arange(n)
+    while active.size:
+        g, x = dG[active], extent[active]
+        c = c0[:, active] + nu * x
+        direction = -np.sign(g)
+        consumed = nu * direction < 0
+
+        # Stopping conditions, checked on the current state
+        finished = np.full(active.size, RUNNING, dtype=np.int8)
+        finished[steps[active] >= max_steps] = MAX_STEPS_REACHED
+        finished[t[active] >= t_end] = T_END_REACHED
+        finished[(consumed & (c <= DEPLETION * c0[:, active])).any(axis=0)] = DEPLETED
+        finished[np.abs(g) <= tol] = EQUILIBRIUM
+        if finished.any():
+            done = active[finished != RUNNING]
+            status[done] = finished[finished != RUNNING]
+            # A settled trajectory stays where it is; later samples keep its final ΔG
+            settled = done[np.isin(status[done], (EQUILIBRIUM, DEPLETED))]
+            columns = np.arange(len(times))
+            profile[settled] = np.where(columns >= recorded[settled, None], dG[settled, None], profile[settled])
+            keep = finished == RUNNING
+            active, g, x, c, direction, consumed = active[keep], g[keep], x[keep], c[:, keep], direction[keep], consumed[:, keep]
+            if not active.size:
+                break
+
+        # Step in extent: bounded by the limiting consumed species and by half the
+        # linearized distance to equilibrium (dΔG/dξ = RT Σ ν²/c)
+        RT = R * T[active]
+        r = rate[active] * np.tanh(-g / (2 * RT))
+        room = np.where(consumed, c / np.abs(nu), np.inf).min(axis=0)
+        slope = (nu ** 2 / c).sum(axis=0)
+        step = np.minimum(MAX_CHANGE * room, HALFWAY * np.abs(g) / (RT * slope))
+        dt = step / np.abs(r)
+        # Land exactly on t_end
+        last = np.minimum(1.0, (t_end - t[active]) / dt)
+        step, dt = step * last, dt * last
+
+        t_before = t[active]
+        extent[active] = x + direction * step
+        t[active] = np.where(last < 1, t_end, t_before + dt)
+        steps[active] += 1
+        dG[active] = deltaG(active, extent[active])
+
+        # ΔG at the sample times passed during this step, linear in t
+        filled = np.searchsorted(times, t[active], side="right")
+        crossed = np.flatnonzero(filled > recorded[active])
+        if crossed.size:
+            columns = np.arange(len(times))
+            rows, columns = np.nonzero((columns >= recorded[active[crossed], None]) & (columns < filled[crossed, None]))
+            rows = crossed[rows]
+            fraction = (times[columns] - t_before[rows]) / dt[rows]
+            profile[active[rows], columns] = g[rows] + fraction * (dG[active[rows]] - g[rows])
+        recorded[active] = filled
+
+    return {
+        "dG_start": dG_start,
+        "dG": dG,
+        "extent": extent,
+        "t": t,
+        "steps": steps,
+        "status": status,
+        "conc": dict(zip(species, c0 + nu * extent)),
+        "profile": profile,
+    }
+
+
+def iter_kinetics(pairs=None, environments=None, log_c=LOG_C, chunk=CHUNK, times=None, **options):
+    """
+    Integrates every pair × environment × log c trajectory (see pair_log_c),
+    chunk trajectories at a time. Yields (summary DataFrame, ΔG profiles at
+    times in kJ/mol) per chunk; times default to profile_times(t_end).
+    """
+    pairs = PAIRS if pairs is None else [as_pair(pair) for pair in pairs]
+    environments = ENVIRONMENTS if environments is None else [as_environment(env) for env in environments]
+    all_log_c = np.atleast_1d(np.asarray(log_c, dtype=float))
+    times = profile_times(options.get("t_end", T_END)) if times is None else times
+    env_T = np.array([env.T for env in environments])
+    env_pH = np.array([env.pH for env in environments])
+    env_I = np.array([env.ionic_strength for env in environments], dtype=float)
+
+    for pair in pairs:
+        log_c = pair_log_c(pair, all_log_c)
+        total = len(environments) * len(log_c)
+        for start in range(0, total, chunk):
+            index = np.arange(start, min(start + chunk, total))
+            env_index, c_index = np.divmod(index, len(log_c))
+            result = integrate(pair, env_T[env_index], env_pH[env_index], initial_conc(pair, log_c[c_index]),
+                               I=env_I[env_index], times=times, **options)
+            summary = pd.DataFrame({
+                "Redox Pair": pair.name,
+                "Environment": [environments[i].name for i in env_index],
+                "T (K)": env_T[env_index],
+                "pH": env_pH[env_index],
+                "log c shift": log_c[c_index],
+                "ΔG start (kJ/mol)": result["dG_start"] / 1000,
+                "ΔG (kJ/mol)": result["dG"] / 1000,
+                "Extent (mol/L)": result["extent"],
+                "Time (s)": result["t"],
+                "Steps": result["steps"],
+                "Status": np.array(STATUS)[result["status"]],
+            })
+            yield summary, result["profile"] / 1000
+
+
+@timed()
+def run_kinetics(log_c=LOG_C, times=None, results_file=results_path, profiles_file=profiles_path,
+                 store=None, **options):
+    """
+    Runs all trajectories, streaming the per-trajectory summary to results_file
+    chunk by chunk. ΔG at times (default: profile_times(t_end)) goes to
+    profiles_file for the trajectories nearest log c = 0.
+    """
+    log_c = np.atleast_1d(np.asarray(log_c, dtype=float))
+    times = profile_times(options.get("t_end", T_END)) if times is None else times
+    reference = log_c[np.argmin(np.abs(log_c))]
+    statuses = {}
+    profiles = []
+    run_id = store.start_run("kinetics") if store is not None else None
+    for first, (summary, profile) in enumerate(iter_kinetics(log_c=log_c, times=times, **options)):
+        # Only the appends are timed as writing; the file is counted once below
+        with stage("write csv"):
+            summary.to_csv(results_file, mode="w" if first == 0 else "a", header=first == 0, index=False)
+        if store is not None:
+            store.add(run_id, "kinetics", summary)
+        for status, number in summary["Status"].value_counts().items():
+            statuses[status] = statuses.get(status, 0) + int(number)
+        rows = (summary["log c shift"] == reference).to_numpy()
+        for (_, row), values in zip(summary[rows].iterrows(), profile[rows]):
+            profiles.append(pd.DataFrame({
+                "Redox Pair": row["Redox Pair"],
+                "Environment": row["Environment"],
+                "Time (s)": times,
+                "ΔG (kJ/mol)": values,
+            }))
+    record_file("write csv", results_file)
+    profiles = pd.concat(profiles, ignore_index=True)
+    with timed_write(profiles_file):
+        profiles.to_csv(profiles_file, index=False)
+    print(f"✅ {sum(statuses.values())} trajectories: " + ", ".join(f"{n} {s}" for s, n in sorted(statuses.items())))
+    print(f"Kinetics results exported to {results_file}")
+    print(f"ΔG(t) profiles exported to {profiles_file}")
+    return profiles
+
+
+if __name__ == "__main__":
+    from main.artifacts import flush, set_render_profile
+    from main.result_store import ResultStore
+
+    parser = argparse.ArgumentParser(description="Integrate redox reactions toward equilibrium over time.")
+    parser.add_argument("--no-plots", action="store_true", help="compute and export data only")
+    parser.add_argument("--preview", action="store_true",
+                        help="fast 72 dpi PNG-only figures instead of publication output (REDOX_RENDER=preview)")
+    parser.add_argument("--log-c-steps", type=int, default=len(LOG_C),
+                        help=f"initial reactant shifts per pair and environment, log c {LOG_C[0]:g}…{LOG_C[-1]:g}")
+    parser.add_argument("--rate", type=float, default=RATE, help="rate constant k, mol/(L·s)")
+    parser.add_argument("--t-end", type=float, default=T_END, help="time horizon, s")
+    parser.add_argument("--tol", type=float, default=TOL, help="|ΔG| (J/mol) treated as equilibrium")
+    parser.add_argument("--chunk", type=int, default=CHUNK, help="trajectories integrated together")
+    args = parser.parse_args()
+    if args.preview:
+        set_render_profile("preview")
+
+    with ResultStore() as store:
+        run_kinetics(log_c=np.linspace(LOG_C[0], LOG_C[-1], args.log_c_steps), store=store,
+                     rate=args.rate, t_end=args.t_end, tol=args.tol, chunk=args.chunk)
+
+    if not args.no_plots:
+        # Plotting stack (matplotlib, seaborn) is only imported when rendering
+        from main.plotting import plot_kinetics_profiles
+        plot_kinetics_profiles()
+    flush()
@@ -3,37 +3,41 @@
 # and exports the results and summary plots.
 
 import os
+import sys
+import argparse
 
 base_dir = os.path.dirname(__file__)
 figures_path = os.path.join(base_dir, "figures_main")
 results_path = os.path.join(base_dir, "results.csv")
+coupling_path = os.path.join(base_dir, "coupling_results.csv")
 os.makedirs(figures_path, exist_ok=True) # Ensure figures folder exists
 
 import pandas as pd # for data manipulation
 
-from thermodynamics import ( 
+if __name__ == "__main__":  # run as a script: resolve main.* from the repo root, not from main/ itself
+    sys.path[0] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+from main.thermodynamics import ( 
     # for thermodynamic calculations
-    calculate_Q,
-    adjust_E0,
     calculate_deltaG,
     calculate_exergy_efficiency_from_G,
     calculate_exergy_efficiency_from_H
 )
 
-from data import redox_pairs, environments # for redox pairs and environmental conditions
+from main.records import PAIRS, ENVIRONMENTS # validated redox pairs and environmental conditions
+from main.instrumentation import timed, count, timed_write # opt-in stage timings (REDOX_PROFILE=1)
+from main.artifacts import flush, set_render_profile # figures and tables are written on a background pool
+from main.result_store import ResultStore # indexed SQLite copy of every run
 
+@timed()
 def run_simulation():
     results = []
-    for env in environments:
-        for pair in redox_pairs:
-            # Update [H+] based on pH
-            if "H+" in pair["conc"]:
-                pair["conc"]["H+"] = 10 ** (-env["pH"])
-
-            Q = calculate_Q(pair)
-            E_adj = adjust_E0(pair['E0'], pair['n'], env['T'], Q)
-            dG = calculate_deltaG(E_adj, pair['n'])
-            dG0 = calculate_deltaG(pair['E0'], pair['n'])
+    for env in ENVIRONMENTS:
+        for pair in PAIRS:
+            # [H+] follows the environment pH; ionic strength only matters with REDOX_ACTIVITY set
+            E_adj = float(pair.E(env.T, env.pH, I=env.ionic_strength))
+            dG = calculate_deltaG(E_adj, pair.n)
+            dG0 = pair.dG0
 
             ex_eff_G = calculate_exergy_efficiency_from_G(dG, dG0)
             ex_eff_H = calculate_exergy_efficiency_from_H(dG, pair['delta_H'])
@@ -47,11 +51,13 @@ def run_simulation():
                 "Exergy Eff (ΔG%)": round(ex_eff_G, 2),
                 "Exergy Eff (ΔH%)": round(ex_eff_H, 2)
             })
+    count("run_simulation", len(results))
     return results
 
 def export_results(results, filename="results.csv"):
     df = pd.DataFrame(results)
-    df.to_csv(filename, index=False)
+    with timed_write(filename):
+        df.to_csv(filename, index=False)
     print(f"\nResults exported to {filename}")
 
 def print_results(results):
@@ -60,16 +66,41 @@ def print_results(results):
         print(f"{r['Redox Pair']} in {r['Environment']} → E: {r['E (V)']} V, ΔG: {r['ΔG (kJ/mol)']} kJ/mol, ExG: {r['Exergy Eff (ΔG%)']}%, ExH: {r['Exergy Eff (ΔH%)']}%")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate all redox pairs across environments.")
+    parser.add_argument("--no-plots", action="store_true", help="compute and export data only")
+    parser.add_argument("--preview", action="store_true",
+                        help="fast 72 dpi PNG-only figures instead of publication output (REDOX_RENDER=preview)")
+    args = parser.parse_args()
+    if args.preview:
+        set_render_profile("preview")
+
     results = run_simulation()
     print_results(results)
     export_results(results, filename=results_path)
 
-    from plotting import generate_all_plots
-    generate_all_plots()
+    # Full reactions: every donor × acceptor combination in every environment
+    from main.coupling import couple_pairs, coupling_table
+    coupled = coupling_table(couple_pairs())
+    with timed_write(coupling_path):
+        coupled.to_csv(coupling_path, index=False)
+    print(f"Coupled reactions exported to {coupling_path}")
+
+    with ResultStore() as store:
+        run_id = store.start_run("main")
+        store.add(run_id, "simulation", pd.DataFrame(results))
+        store.add(run_id, "coupling", coupled)
+
+    if not args.no_plots:
+        # Plotting stack (matplotlib, seaborn) is only imported when rendering
+        from main.plotting import generate_all_plots
+        generate_all_plots()
 
     # Auto-generate tables and redox ladder figure
-    import generate_main_table
+    from main import generate_main_table
     generate_main_table.generate_latex_table()
 
-    import generate_redox_reference_table
+    from main import generate_redox_reference_table
     generate_redox_reference_table.generate_redox_reference_table()
+
+    # Barrier: every queued figure and table is on disk before we exit
+    flush()
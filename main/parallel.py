@@ -0,0 +1,79 @@
+# parallel.py
+# Process-pool execution for the per-pair compute stages, with inputs and
+# outputs in shared memory.
+#
+# map_into() preallocates every output array in a memory-mapped scratch file
+# (on /dev/shm where available, i.e. RAM). Inputs such as the T/pH grids are
+# written once to the same kind of file. Each worker opens the files by path and
+# writes its results straight into its own slice, so only the small task tuples
+# are pickled; the pair table itself is never sent, as workers index the
+# PAIRS they import (and surrogate tables are memory-mapped, not copied).
+#
+#   REDOX_WORKERS=4 python sensitivity/sensitivity.py     # or --workers 4
+# Without it (or with 1 worker) the same tasks run inline on plain arrays.
+
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+WORKERS = int(os.environ.get("REDOX_WORKERS", 1))
+
+
+def _scratch_dir():
+    shm = "/dev/shm"
+    return tempfile.mkdtemp(prefix="redox-", dir=shm if os.path.isdir(shm) and os.access(shm, os.W_OK) else None)
+
+
+def _open(spec, mode):
+    path, shape, dtype = spec
+    return np.memmap(path, dtype=dtype, mode=mode, shape=tuple(shape))
+
+
+def _run_task(fn, input_specs, output_specs, task):
+    arrays = {name: _open(spec, "r") for name, spec in input_specs.items()}
+    arrays.update({name: _open(spec, "r+") for name, spec in output_specs.items()})
+    fn(arrays, *task)
+    for name in output_specs:
+        arrays[name].flush()
+
+
+def map_into(fn, tasks, outputs, inputs=None, workers=None):
+    """
+    Calls fn(arrays, *task) for every task and returns the output arrays.
+
+    outputs maps names to (shape, dtype) and is preallocated; inputs maps names
+    to arrays. fn gets both as one dict of arrays and must write only its own
+    slice of the outputs. fn must be a module-level function so the pool can
+    import it. With workers ≤ 1 the tasks run in this process.
+    """
+    inputs = inputs or {}
+    workers = WORKERS if workers is None else workers
+    if workers <= 1 or len(tasks) <= 1:
+        arrays = {name: np.asarray(values) for name, values in inputs.items()}
+        arrays.update({name: np.zeros(shape, dtype) for name, (shape, dtype) in outputs.items()})
+        for task in tasks:
+            fn(arrays, *task)
+        return {name: arrays[name] for name in outputs}
+
+    scratch = _scratch_dir()
+    try:
+        input_specs = {}
+        for name, values in inputs.items():
+            values = np.asarray(values)
+            input_specs[name] = (os.path.join(scratch, f"in_{name}.dat"), values.shape, values.dtype.str)
+            _open(input_specs[name], "w+")[...] = values
+        output_specs = {name: (os.path.join(scratch, f"out_{name}.dat"), shape, np.dtype(dtype).str)
+                        for name, (shape, dtype) in outputs.items()}
+        for spec in output_specs.values():
+            _open(spec, "w+").flush()   # zero-filled
+
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            futures = [pool.submit(_run_task, fn, input_specs, output_specs, task) for task in tasks]
+            for future in futures:
+                future.result()   # re-raises a worker's exception
+        return {name: np.array(_open(spec, "r")) for name, spec in output_specs.items()}
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
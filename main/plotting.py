@@ -4,10 +4,17 @@
 # - Redox ladder based on E⁰ and ΔH from reference data
 
 import os
+import sys
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+if __name__ == "__main__":  # run as a script: resolve main.* from the repo root, not from main/ itself
+    sys.path[0] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+from main.artifacts import save_figure
+from main.instrumentation import timed
+
 base_dir = os.path.dirname(__file__)
 csv_path = os.path.join(base_dir, "results.csv")
 figures_png = os.path.join(base_dir, "../main/figures_main")
@@ -15,6 +22,7 @@ figures_pdf = os.path.join(base_dir, "../report/figures/figures_main")
 os.makedirs(figures_png, exist_ok=True)
 os.makedirs(figures_pdf, exist_ok=True)
 
+@timed()
 def plot_dG_by_redox_and_env():
     df = pd.read_csv(csv_path)
     df["Redox Pair"] = df["Redox Pair"].astype(str)
@@ -34,10 +42,10 @@ def plot_dG_by_redox_and_env():
     plt.xticks(rotation=45, ha='right')
     plt.grid(True, linestyle="--", alpha=0.5)
     plt.tight_layout()
-    plt.savefig(os.path.join(figures_pdf, "deltaG_by_environment.pdf"))
-    plt.savefig(os.path.join(figures_png, "deltaG_by_environment.png"), dpi=300)
+    save_figure(os.path.join(figures_png, "deltaG_by_environment.png"), os.path.join(figures_pdf, "deltaG_by_environment.pdf"))
     plt.close()
 
+@timed()
 def plot_exergy_efficiency():
     df = pd.read_csv(csv_path)
     df["Redox Pair"] = df["Redox Pair"].astype(str)
@@ -57,10 +65,10 @@ def plot_exergy_efficiency():
     plt.xticks(rotation=45, ha='right')
     plt.grid(True, linestyle="--", alpha=0.5)
     plt.tight_layout()
-    plt.savefig(os.path.join(figures_pdf, "exergy_efficiency_H.pdf"))
-    plt.savefig(os.path.join(figures_png, "exergy_efficiency_H.png"), dpi=300)
+    save_figure(os.path.join(figures_png, "exergy_efficiency_H.png"), os.path.join(figures_pdf, "exergy_efficiency_H.pdf"))
     plt.close()
 
+@timed()
 def plot_redox_ladder():
     import pandas as pd
     import matplotlib.pyplot as plt
@@ -68,7 +76,7 @@ def plot_redox_ladder():
     import matplotlib.cm as cm
     import matplotlib.colors as mcolors
     import os
-    from data import redox_pairs
+    from main.data import redox_pairs
 
     ladder = []
     for pair in redox_pairs:
@@ -90,7 +98,7 @@ def plot_redox_ladder():
 
     # Normalize efficiency values for coloring
     norm = mcolors.Normalize(vmin=df["Exergy Efficiency"].min(), vmax=df["Exergy Efficiency"].max())
-    cmap = cm.get_cmap("viridis")
+    cmap = plt.get_cmap("viridis")
     colors = [cmap(norm(val)) for val in df["Exergy Efficiency"]]
 
     # Plot
@@ -102,14 +110,36 @@ def plot_redox_ladder():
     # Colorbar
     sm = cm.ScalarMappable(cmap=cmap, norm=norm)
     sm.set_array([])
-    cbar = plt.colorbar(sm)
+    cbar = plt.colorbar(sm, ax=plt.gca())
     cbar.set_label("Exergy Efficiency (%)")
 
     plt.tight_layout()
-    plt.savefig(os.path.join(figures_pdf, "redox_ladder.pdf"))
-    plt.savefig(os.path.join(figures_png, "redox_ladder.png"), dpi=300)
+    save_figure(os.path.join(figures_png, "redox_ladder.png"), os.path.join(figures_pdf, "redox_ladder.pdf"))
     plt.close()
 
+@timed()
+def plot_kinetics_profiles():
+    # ΔG(t) toward equilibrium for the stored concentrations (kinetics.py output)
+    df = pd.read_csv(os.path.join(base_dir, "kinetics_profiles.csv"))
+    pairs = df["Redox Pair"].unique()
+    cols = 3
+    rows = -(-len(pairs) // cols)
+    fig, axes = plt.subplots(rows, cols, figsize=(5 * cols, 3.5 * rows), squeeze=False)
+    for ax, pair in zip(axes.flat, pairs):
+        sns.lineplot(data=df[df["Redox Pair"] == pair], x="Time (s)", y="ΔG (kJ/mol)",
+                     hue="Environment", palette="crest", ax=ax, legend=ax is axes.flat[0])
+        ax.axhline(0, color="grey", linewidth=0.8)
+        ax.set_xscale("log")
+        ax.set_title(pair)
+        ax.grid(True, linestyle="--", alpha=0.5)
+    for ax in axes.flat[len(pairs):]:
+        ax.set_visible(False)
+    fig.suptitle("ΔG Approaching Equilibrium over Time")
+    fig.tight_layout()
+    save_figure(os.path.join(figures_png, "kinetics_profiles.png"), os.path.join(figures_pdf, "kinetics_profiles.pdf"), fig=fig)
+    plt.close(fig)
+
+@timed()
 def generate_all_plots():
     plot_dG_by_redox_and_env()
     plot_exergy_efficiency()
@@ -0,0 +1,245 @@
+# records.py
+# Typed, immutable views of the redox pairs and environments in data.py.
+#
+# Each record is validated once when it is built and carries the quantities the
+# hot loops need (n·F, ΔH in J, net H⁺ count, ln Q of the fixed species), so a
+# whole T/pH/concentration grid is evaluated without copying or merging dicts.
+# Records also behave as read-only mappings (pair["E0"], {**pair}), so existing
+# dict-based code such as calculate_Q keeps working unchanged.
+
+import math
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from types import MappingProxyType
+
+import numpy as np
+
+from main.thermodynamics import F, R
+from main.data import redox_pairs, environments
+import main.speciation as speciation_model
+import main.activity as activity_model
+
+LN10 = math.log(10)
+
+PAIR_KEYS = ("name", "reaction", "E0", "n", "delta_H", "reactants", "products", "conc", "charges")
+ENVIRONMENT_KEYS = ("name", "pH", "T", "ionic_strength")
+OPTIONAL_KEYS = ("charges", "ionic_strength")
+
+# Aqueous chemistry: no liquid water below ~200 K (supercooled) or above the critical point
+T_RANGE = (200.0, 650.0)   # K
+
+
+def check_conditions(T, pH, ionic_strength=None, where=None):
+    """
+    Raises ValueError unless T is within T_RANGE, 0 ≤ pH ≤ 14 and, if given,
+    0 ≤ I ≤ activity.MAX_IONIC_STRENGTH. Takes scalars or arrays; NaN fails.
+    """
+    limits = (
+        (f"temperature must be within {T_RANGE[0]:g}–{T_RANGE[1]:g} K", T,
+         lambda v: (v >= T_RANGE[0]) & (v <= T_RANGE[1])),
+        ("pH must be within 0–14", pH, lambda v: (v >= 0) & (v <= 14)),
+        (f"ionic strength must be within 0–{activity_model.MAX_IONIC_STRENGTH:g} mol/L", ionic_strength,
+         lambda v: (v >= 0) & (v <= activity_model.MAX_IONIC_STRENGTH)),
+    )
+    for message, values, valid in limits:
+        if values is None:
+            continue
+        values = np.asarray(values, dtype=float)
+        bad = ~valid(values)
+        if bad.any():
+            prefix = f"{where}: " if where else ""
+            raise ValueError(f"{prefix}{message}, got {float(values[bad].flat[0]):g}")
+
+
+def _frozen(mapping):
+    return MappingProxyType(dict(mapping))
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class RedoxPair(Mapping):
+    name: str
+    reaction: str
+    E0: float        # V
+    n: int
+    delta_H: float   # kJ/mol
+    reactants: Mapping
+    products: Mapping
+    conc: Mapping    # mol/L; species not listed have unit activity
+    charges: Mapping = field(default_factory=dict)   # species not listed are neutral
+
+    # Precomputed at load
+    nF: float = field(init=False)           # C/mol
+    dG0: float = field(init=False)          # J/mol
+    delta_H_J: float = field(init=False)    # J/mol
+    h_plus: float = field(init=False)       # net H⁺ consumed when [H⁺] follows pH (0 otherwise)
+    stoich: Mapping = field(init=False)     # species -> net coefficient (products − reactants)
+    ln_conc: Mapping = field(init=False)    # species -> ln of the stored concentration
+    lnQ_fixed: float = field(init=False)    # ln Q of every species except a pH-controlled H⁺
+    speciated: tuple = field(init=False)    # (species, coefficient) for species with acid–base speciation
+    ionic_terms: tuple = field(init=False)  # (coefficient, charge, ion size) for the activity model
+
+    def __post_init__(self):
+        set_ = object.__setattr__
+        set_(self, "reactants", _frozen(self.reactants))
+        set_(self, "products", _frozen(self.products))
+        set_(self, "conc", _frozen(self.conc))
+        set_(self, "charges", _frozen(self.charges))
+
+        stoich = {}
+        for species, coeff in self.products.items():
+            stoich[species] = stoich.get(species, 0) + coeff
+        for species, coeff in self.reactants.items():
+            stoich[species] = stoich.get(species, 0) - coeff
+        ln_conc = {species: math.log(self.conc.get(species, 1)) for species in stoich}
+
+        ph_controlled = "H+" in self.conc
+        h_plus = -stoich.get("H+", 0) if ph_controlled else 0
+        lnQ_fixed = sum(coeff * ln_conc[species] for species, coeff in stoich.items()
+                        if not (ph_controlled and species == "H+"))
+
+        set_(self, "nF", self.n * F)
+        set_(self, "dG0", -self.n * F * self.E0)
+        set_(self, "delta_H_J", self.delta_H * 1000)
+        set_(self, "h_plus", h_plus)
+        set_(self, "stoich", MappingProxyType(stoich))
+        set_(self, "ln_conc", MappingProxyType(ln_conc))
+        set_(self, "lnQ_fixed", lnQ_fixed)
+        set_(self, "speciated", tuple((species, coeff) for species, coeff in stoich.items()
+                                      if species in speciation_model.SPECIES and coeff))
+        # A pH-controlled H⁺ is already an activity
+        set_(self, "ionic_terms", tuple(
+            (coeff, self.charges[species], activity_model.ION_SIZE.get(species, activity_model.DEFAULT_ION_SIZE))
+            for species, coeff in stoich.items()
+            if coeff and self.charges.get(species, 0) and not (ph_controlled and species == "H+")
+        ))
+
+    @classmethod
+    def from_dict(cls, pair):
+        missing = [key for key in PAIR_KEYS if key not in pair and key not in OPTIONAL_KEYS]
+        if missing:
+            raise ValueError(f"Redox pair {pair.get('name', '?')!r} is missing {', '.join(missing)}")
+        name = pair["name"]
+        if not isinstance(pair["n"], int) or pair["n"] <= 0:
+            raise ValueError(f"{name}: electron count n must be a positive integer, got {pair['n']!r}")
+        for key in ("E0", "delta_H"):
+            if not math.isfinite(pair[key]):
+                raise ValueError(f"{name}: {key} must be finite, got {pair[key]!r}")
+        for species, value in pair["conc"].items():
+            if not value > 0:
+                raise ValueError(f"{name}: concentration of {species} must be positive, got {value!r}")
+        for side in ("reactants", "products"):
+            for species, coeff in pair[side].items():
+                if not coeff > 0:
+                    raise ValueError(f"{name}: coefficient of {species} in {side} must be positive")
+        for species, charge in pair.get("charges", {}).items():
+            if not isinstance(charge, int):
+                raise ValueError(f"{name}: charge of {species} must be an integer, got {charge!r}")
+        return cls(**{key: pair[key] for key in PAIR_KEYS if key in pair})
+
+    # --- dict-style access for existing callers ---
+    def __getitem__(self, key):
+        if key not in PAIR_KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(PAIR_KEYS)
+
+    def __len__(self):
+        return len(PAIR_KEYS)
+
+    # --- vectorized thermodynamics ---
+    def lnQ(self, pH=None, conc=None, T=None, speciation=None, I=None, activity=None):
+        """
+        ln Q, broadcasting over pH and any concentration overrides.
+
+        conc maps species to (arrays of) concentrations replacing the stored
+        values; pH sets [H⁺] = 10^-pH for pairs that track H⁺ and then takes
+        precedence over an H⁺ entry in conc, as in the simulation scripts.
+        With speciation (default: speciation.ENABLED), CO2, H2S and acetate
+        concentrations are system totals and only their active fraction at
+        (pH, T) enters Q. Given an ionic strength I, charged species enter as
+        activities under the activity model (default: activity.MODEL).
+        """
+        lnQ = self.lnQ_fixed
+        if self.h_plus:
+            if pH is None:
+                lnQ = lnQ - self.h_plus * self.ln_conc["H+"]
+            else:
+                lnQ = lnQ + self.h_plus * LN10 * np.asarray(pH, dtype=float)
+        if conc:
+            for species, values in conc.items():
+                coeff = self.stoich.get(species, 0)
+                if species == "H+" and self.h_plus and pH is not None:
+                    continue
+                if coeff:
+                    lnQ = lnQ + coeff * (np.log(values) - self.ln_conc[species])
+        if self.speciated and (speciation_model.ENABLED if speciation is None else speciation):
+            if pH is None:
+                pH = -np.log10((conc or {}).get("H+", self.conc.get("H+", 1e-7)))
+            for species, coeff in self.speciated:
+                lnQ = lnQ + coeff * speciation_model.ln_fraction(species, pH, speciation_model.T_REF if T is None else T)
+        if self.ionic_terms and I is not None:
+            lnQ = lnQ + activity_model.ln_gamma_sum(self.ionic_terms, I, speciation_model.T_REF if T is None else T, activity)
+        # Species the pair does not depend on still set the output shape
+        shape = np.broadcast_shapes(np.shape(lnQ), np.shape(pH), *(np.shape(v) for v in (conc or {}).values()))
+        return np.broadcast_to(lnQ, shape)
+
+    def E(self, T, pH=None, conc=None, speciation=None, I=None, activity=None):
+        """Nernst-adjusted potential (V)."""
+        T = np.asarray(T, dtype=float)
+        return self.E0 - (R * T) / self.nF * self.lnQ(pH, conc, T, speciation, I, activity)
+
+    def deltaG(self, T, pH=None, conc=None, speciation=None, I=None, activity=None):
+        """ΔG (J/mol) = ΔG⁰ + RT ln Q."""
+        T = np.asarray(T, dtype=float)
+        return self.dG0 + R * T * self.lnQ(pH, conc, T, speciation, I, activity)
+
+    def exergy_efficiency_H(self, deltaG):
+        """ΔH-based exergy efficiency (%), capped to 0–100; NaN when ΔH = 0."""
+        deltaG = np.asarray(deltaG, dtype=float)
+        if abs(self.delta_H) < 1e-8:
+            return np.full(deltaG.shape, np.nan)
+        return np.clip(deltaG / self.delta_H_J, 0.0, 1.0) * 100
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class Environment(Mapping):
+    name: str
+    pH: float
+    T: float       # K
+    ionic_strength: float = 0.0   # mol/L
+
+    @classmethod
+    def from_dict(cls, env):
+        missing = [key for key in ENVIRONMENT_KEYS if key not in env and key not in OPTIONAL_KEYS]
+        if missing:
+            raise ValueError(f"Environment {env.get('name', '?')!r} is missing {', '.join(missing)}")
+        ionic_strength = env.get("ionic_strength", 0.0)
+        check_conditions(env["T"], env["pH"], ionic_strength, where=env["name"])
+        return cls(env["name"], float(env["pH"]), float(env["T"]), float(ionic_strength))
+
+    def __getitem__(self, key):
+        if key not in ENVIRONMENT_KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(ENVIRONMENT_KEYS)
+
+    def __len__(self):
+        return len(ENVIRONMENT_KEYS)
+
+
+def as_pair(pair):
+    """Adapter: returns pair unchanged if it is already a RedoxPair, else validates the dict."""
+    return pair if isinstance(pair, RedoxPair) else RedoxPair.from_dict(pair)
+
+
+def as_environment(env):
+    return env if isinstance(env, Environment) else Environment.from_dict(env)
+
+
+# Validated once at import
+PAIRS = tuple(as_pair(pair) for pair in redox_pairs)
+ENVIRONMENTS = tuple(as_environment(env) for env in environments)
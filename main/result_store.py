@@ -0,0 +1,266 @@
+# result_store.py
+# One local SQLite file holding the simulation, coupling, optimization and
+# sensitivity outputs. Each run gets a run ID, and rows are indexed by pair,
+# environment and run, so downstream analysis can query it directly instead of
+# loading and filtering every CSV.
+#
+#   from main.result_store import ResultStore
+#   with ResultStore() as store:
+#       store.query(dG_kJ__lt=-50, pH__gt=8)           # all pairs with ΔG < −50 kJ/mol at pH > 8
+#
+#   python main/result_store.py "dG_kJ < -50" "pH > 8" --kind simulation
+#
+# Every run appends a full copy of its rows, so only the newest KEEP_RUNS runs
+# of each kind (main, optimization, sensitivity, ...) are kept; older ones are
+# deleted when a new run starts and their pages are reused. REDOX_STORE_KEEP=0
+# keeps everything; `--prune N` trims an existing file and compacts it.
+
+import os
+import sys
+import re
+import sqlite3
+import argparse
+from datetime import datetime
+
+import pandas as pd
+
+if __name__ == "__main__":  # run as a script: resolve main.* from the repo root, not from main/ itself
+    sys.path[0] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+from main.records import ENVIRONMENTS
+
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+default_path = os.path.join(root_dir, "redox_results.sqlite")
+KEEP_RUNS = int(os.environ.get("REDOX_STORE_KEEP", 10))
+
+# CSV column names -> store columns
+COLUMN_MAP = {
+    "Redox Pair": "pair",
+    "Acceptor": "acceptor",
+    "Donor": "donor",
+    "Reaction": "reaction",
+    "Environment": "environment",
+    "T (K)": "T",
+    "pH": "pH",
+    "E (V)": "E_V",
+    "ΔE (V)": "dE_V",
+    "n (e-)": "n",
+    "ΔG (kJ/mol)": "dG_kJ",
+    "Exergy Eff (ΔG%)": "exergy_G",
+    "Exergy Eff (ΔH%)": "exergy_H",
+    "Exergy Efficiency (%)": "exergy_H",
+    "log c shift": "log_c",
+    "ΔG start (kJ/mol)": "dG_start_kJ",
+    "Extent (mol/L)": "extent",
+    "Time (s)": "time_s",
+    "Steps": "steps",
+    "Status": "status",
+    "Tied Points": "tied",
+}
+
+# Kinds whose columns mean something else than the half-cell snapshot values,
+# kept apart so a plain query(dG_kJ__lt=...) never mixes them in
+KIND_COLUMN_MAP = {
+    "coupling": {"ΔG (kJ/mol)": "dG_reaction_kJ"},   # full donor + acceptor reaction
+    "kinetics": {"ΔG (kJ/mol)": "dG_end_kJ"},         # state a trajectory stopped in, not a snapshot
+}
+
+COLUMNS = {
+    "run_id": "INTEGER NOT NULL REFERENCES runs(run_id)",
+    "kind": "TEXT NOT NULL",
+    "pair": "TEXT",
+    "acceptor": "TEXT",
+    "donor": "TEXT",
+    "reaction": "TEXT",
+    "environment": "TEXT",
+    "T": "REAL",
+    "pH": "REAL",
+    "log_c": "REAL",
+    "n": "INTEGER",
+    "E_V": "REAL",
+    "dE_V": "REAL",
+    "dG_kJ": "REAL",
+    "dG_reaction_kJ": "REAL",
+    "exergy_G": "REAL",
+    "exergy_H": "REAL",
+    "dG_start_kJ": "REAL",
+    "dG_end_kJ": "REAL",
+    "extent": "REAL",
+    "time_s": "REAL",
+    "steps": "INTEGER",
+    "status": "TEXT",
+    "tied": "INTEGER",
+}
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    created TEXT NOT NULL,
+    note TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    {", ".join(f"{name} {decl}" for name, decl in COLUMNS.items())}
+);
+CREATE INDEX IF NOT EXISTS idx_results_pair ON results (pair, kind);
+CREATE INDEX IF NOT EXISTS idx_results_environment ON results (environment, kind);
+CREATE INDEX IF NOT EXISTS idx_results_run ON results (run_id);
+"""
+
+OPERATORS = {"lt": "<", "le": "<=", "gt": ">", "ge": ">=", "eq": "=", "ne": "!="}
+CONDITION = re.compile(r"^\s*(\w+)\s*(<=|>=|!=|==|=|<|>)\s*(.+?)\s*$")
+SYMBOLS = {"<": "lt", "<=": "le", ">": "gt", ">=": "ge", "=": "eq", "==": "eq", "!=": "ne"}
+
+
+def parse_condition(text):
+    """Turns "dG_kJ < -50" into the keyword form {"dG_kJ__lt": -50.0}."""
+    match = CONDITION.match(text)
+    if not match:
+        raise ValueError(f"Cannot parse condition {text!r}; expected e.g. 'pH > 8'")
+    column, symbol, value = match.groups()
+    try:
+        value = float(value)
+    except ValueError:
+        value = value.strip("'\"")
+    return {f"{column}__{SYMBOLS[symbol]}": value}
+
+
+class ResultStore:
+    def __init__(self, path=default_path, keep=KEEP_RUNS):
+        self.path = path
+        self.keep = keep
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+        # Stores created before a column was added get it appended
+        existing = {row[1] for row in self.conn.execute("PRAGMA table_info(results)")}
+        for name, decl in COLUMNS.items():
+            if name not in existing:
+                self.conn.execute(f"ALTER TABLE results ADD COLUMN {name} {decl}")
+        if existing and "acceptor" not in existing:
+            # Coupling rows used to share pair/E_V/dG_kJ with the half-cell rows
+            self.conn.execute(
+                "UPDATE results SET acceptor = pair, dE_V = E_V, dG_reaction_kJ = dG_kJ, "
+                "pair = NULL, E_V = NULL, dG_kJ = NULL WHERE kind = 'coupling'"
+            )
+        self.conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+    def start_run(self, kind, note=None):
+        cur = self.conn.execute(
+            "INSERT INTO runs (kind, created, note) VALUES (?, ?, ?)",
+            (kind, datetime.now().isoformat(timespec="seconds"), note)
+        )
+        if self.keep:
+            self.prune(self.keep, kind)
+        self.conn.commit()
+        return cur.lastrowid
+
+    def prune(self, keep, kind=None):
+        """Deletes all but the newest keep runs of kind (default: of every kind); returns the runs removed."""
+        old = (
+            "SELECT run_id FROM (SELECT run_id, kind, "
+            "ROW_NUMBER() OVER (PARTITION BY kind ORDER BY run_id DESC) AS age FROM runs) "
+            "WHERE age > ?" + (" AND kind = ?" if kind is not None else "")
+        )
+        params = (keep,) if kind is None else (keep, kind)
+        self.conn.execute(f"DELETE FROM results WHERE run_id IN ({old})", params)
+        removed = self.conn.execute(f"DELETE FROM runs WHERE run_id IN ({old})", params).rowcount
+        self.conn.commit()
+        return removed
+
+    def add(self, run_id, kind, df, **constants):
+        """
+        Appends a result table under run_id.
+
+        df keeps the CSV column names used across the project; they are mapped
+        to store columns (per kind where KIND_COLUMN_MAP says so), and keyword constants fill columns the table lacks
+        (e.g. T=300.0 for a pH sweep). Simulation rows without T/pH get them
+        from their environment.
+        """
+        rows = df.rename(columns={**COLUMN_MAP, **KIND_COLUMN_MAP.get(kind, {})})
+        rows = rows.loc[:, ~rows.columns.duplicated()]
+        for column, value in constants.items():
+            rows[column] = value
+        if "environment" in rows and "T" not in rows:
+            by_name = {env.name: env for env in ENVIRONMENTS}
+            rows["T"] = rows["environment"].map(lambda name: by_name[name].T if name in by_name else None)
+            rows["pH"] = rows["environment"].map(lambda name: by_name[name].pH if name in by_name else None)
+        rows["run_id"] = run_id
+        rows["kind"] = kind
+        rows = rows[[column for column in COLUMNS if column in rows]]
+        rows.to_sql("results", self.conn, if_exists="append", index=False)
+        self.conn.commit()
+        return len(rows)
+
+    def latest_run(self, kind):
+        row = self.conn.execute("SELECT MAX(run_id) FROM runs WHERE kind = ?", (kind,)).fetchone()
+        return row[0]
+
+    def query(self, kind=None, pair=None, environment=None, run_id=None, latest=True, columns=None, **conditions):
+        """
+        Returns matching rows as a DataFrame.
+
+        Conditions use <column>__<op> keywords with op in lt, le, gt, ge, eq,
+        ne (or a bare column for equality), e.g. query(dG_kJ__lt=-50, pH__gt=8).
+        By default only the most recent run of each kind is searched; pass
+        latest=False for all runs or run_id for a specific one.
+        """
+        clauses, params = [], []
+        for column, value in (("kind", kind), ("pair", pair), ("environment", environment), ("run_id", run_id)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        for key, value in conditions.items():
+            column, _, op = key.partition("__")
+            if column not in COLUMNS or (op or "eq") not in OPERATORS:
+                raise ValueError(f"Unknown condition {key!r}")
+            clauses.append(f"{column} {OPERATORS[op or 'eq']} ?")
+            params.append(value)
+        if latest and run_id is None:
+            clauses.append("run_id IN (SELECT MAX(run_id) FROM runs GROUP BY kind)")
+
+        selected = columns or list(COLUMNS)
+        unknown = [column for column in selected if column not in COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+        sql = f"SELECT {', '.join(selected)} FROM results"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        return pd.read_sql_query(sql, self.conn, params=params)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the local result store.")
+    parser.add_argument("conditions", nargs="*", help="conditions such as 'dG_kJ < -50' 'pH > 8'")
+    parser.add_argument("--kind", help="simulation, coupling, optimization, efficiency_ties, sweep_pH, sweep_T or kinetics")
+    parser.add_argument("--pair")
+    parser.add_argument("--environment")
+    parser.add_argument("--all-runs", action="store_true", help="search every run, not just the latest")
+    parser.add_argument("--db", default=default_path)
+    parser.add_argument("--prune", type=int, metavar="N",
+                        help="keep only the newest N runs of each kind, compact the file and exit")
+    args = parser.parse_args()
+
+    if args.prune is not None:
+        with ResultStore(args.db, keep=0) as store:
+            removed = store.prune(args.prune)
+            store.conn.execute("VACUUM")
+        print(f"✅ Removed {removed} old runs; {os.path.getsize(args.db) / 1e6:.1f} MB left.")
+        raise SystemExit
+
+    conditions = {}
+    for text in args.conditions:
+        conditions.update(parse_condition(text))
+    with ResultStore(args.db) as store:
+        df = store.query(kind=args.kind, pair=args.pair, environment=args.environment,
+                         latest=not args.all_runs, **conditions)
+    print(df.dropna(axis=1, how="all").to_string(index=False))
@@ -0,0 +1,326 @@
+# service.py
+# Long-lived local HTTP/JSON service for ΔG queries.
+#
+# Instead of running main.py and parsing results.csv, other tools POST batches
+# of conditions to a process that keeps the validated pair table, speciation
+# tables and activity cache warm. Each batch is grouped by pair and evaluated
+# with the vectorized kernels, so a query costs microseconds instead of a
+# process start and a full recompute.
+#
+#   python main/service.py [--host 127.0.0.1] [--port 8765]
+#
+#   POST /evaluate   {"conditions": [{"pair": "CO2/CH4", "T": 343.15, "pH": 9.0},
+#                                    {"pair": "Fe3+/Fe2+", "environment": "alkaline_vent"},
+#                                    {"pair": "CO2/CH4", "T": 300, "pH": 7, "conc": {"CO2": 1e-2}, "I": 0.7}],
+#                     "speciation": false, "activity": "davies"}          # optional model switches
+#                -> {"results": [{"pair": ..., "E_V": ..., "dG_kJ": ..., "exergy_H": ...}, ...]}
+#   POST /evaluate   {"columns": {"pair": "CO2/CH4", "T": [...], "pH": [...]}}    # large batches
+#                -> {"E_V": [...], "dG_kJ": [...], "exergy_H": [...]}
+#   GET  /pairs      pair and environment names
+#   GET  /metrics    request/condition counts, latency percentiles (µs) and throughput
+#   GET  /health
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+from collections import deque
+
+import numpy as np
+
+if __name__ == "__main__":  # run as a script: resolve main.* from the repo root, not from main/ itself
+    sys.path[0] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+from main.records import PAIRS, ENVIRONMENTS, check_conditions
+import main.speciation as speciation_model
+import main.activity as activity_model
+
+PAIR_BY_NAME = {pair.name: pair for pair in PAIRS}
+ENVIRONMENT_BY_NAME = {env.name: env for env in ENVIRONMENTS}
+
+MAX_BODY = 64 * 1024 * 1024
+LATENCY_SAMPLES = 10_000
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+               500: "Internal Server Error"}
+
+
+def _finite(name, values):
+    """values as a float array; NaN/inf are a bad request, not a NaN answer."""
+    values = np.asarray(values, dtype=float)
+    if not np.isfinite(values).all():
+        raise ValueError(f"{name} must be a finite number")
+    return values
+
+
+def _positive(name, values):
+    values = _finite(name, values)
+    if not (values > 0).all():
+        raise ValueError(f"{name} must be positive")
+    return values
+
+
+def _mapping(name, value):
+    if not isinstance(value, dict):
+        raise ValueError(f"{name} must be a JSON object")
+    return value
+
+
+def _condition(c):
+    """(pair, T, pH, I, conc) for one condition; an environment fills T, pH and I."""
+    _mapping("Each condition", c)
+    pair = PAIR_BY_NAME.get(c.get("pair"))
+    if pair is None:
+        raise ValueError(f"Unknown pair {c.get('pair')!r}")
+    env = None
+    if "environment" in c:
+        env = ENVIRONMENT_BY_NAME.get(c["environment"])
+        if env is None:
+            raise ValueError(f"Unknown environment {c['environment']!r}")
+    T = c.get("T", env.T if env else None)
+    pH = c.get("pH", env.pH if env else None)
+    if T is None or pH is None:
+        raise ValueError(f"Condition for {pair.name} needs T and pH (or an environment)")
+    I = c.get("I", env.ionic_strength if env else None)
+    conc = _mapping("conc", c.get("conc") or {})
+    _check_species(pair, conc)
+    T, pH = float(_finite("T", T)), float(_finite("pH", pH))
+    I = None if I is None else float(_finite("I", I))
+    check_conditions(T, pH, I)
+    return (pair, T, pH, I,
+            {species: float(_positive(f"conc[{species}]", value)) for species, value in conc.items()})
+
+
+def _check_species(pair, conc):
+    if "H+" in conc:
+        # pair.lnQ would silently drop it in favour of pH
+        raise ValueError("H+ is set through pH, not conc")
+    unknown = set(conc) - set(pair.conc)
+    if unknown:
+        raise ValueError(f"{pair.name} has no species {', '.join(sorted(unknown))}")
+
+
+def _evaluate_group(pair, T, pH, conc, I, speciation, activity):
+    dG = pair.deltaG(T, pH, conc or None, speciation=speciation, I=I, activity=activity)
+    return -dG / pair.nF, dG / 1000, pair.exergy_efficiency_H(dG)
+
+
+def _nan_to_none(values):
+    # JSON has no NaN; exergy is undefined for ΔH = 0
+    return [None if v != v else v for v in values.tolist()]
+
+
+def evaluate(conditions, speciation=None, activity=None):
+    """
+    E (V), ΔG (kJ/mol) and ΔH-based exergy efficiency (%) for a list of conditions.
+
+    Conditions sharing a pair, the same concentration overrides and whether I
+    is given are evaluated together as one vectorized call.
+    """
+    parsed = [_condition(c) for c in conditions]
+    groups = {}
+    for index, (pair, T, pH, I, conc) in enumerate(parsed):
+        groups.setdefault((pair.name, tuple(sorted(conc)), I is None), []).append(index)
+
+    E, dG, exergy = (np.empty(len(parsed)) for _ in range(3))
+    for (name, species, no_I), indices in groups.items():
+        rows = [parsed[i] for i in indices]
+        T = np.array([row[1] for row in rows])
+        pH = np.array([row[2] for row in rows])
+        I = None if no_I else np.array([row[3] for row in rows], dtype=float)
+        conc = {s: np.array([row[4][s] for row in rows], dtype=float) for s in species}
+        E[indices], dG[indices], exergy[indices] = _evaluate_group(
+            PAIR_BY_NAME[name], T, pH, conc, I, speciation, activity)
+
+    return [
+        {"pair": row[0].name, "T": row[1], "pH": row[2], "E_V": e, "dG_kJ": g, "exergy_H": x}
+        for row, e, g, x in zip(parsed, E.tolist(), dG.tolist(), _nan_to_none(exergy))
+    ]
+
+
+def evaluate_columns(columns, speciation=None, activity=None):
+    """
+    Column form for large batches: {"pair": name or list, "T": [...], "pH": [...],
+    optional "I": [...] and "conc": {species: [...]}}. Returns E_V, dG_kJ and
+    exergy_H as lists, skipping the per-row parsing of evaluate().
+    """
+    if "T" not in columns or "pH" not in columns:
+        raise ValueError('"columns" needs T and pH')
+    # Scalars are one-row columns
+    T = np.atleast_1d(_finite("T", columns["T"]))
+    pH = np.atleast_1d(_finite("pH", columns["pH"]))
+    T, pH = np.broadcast_arrays(T, pH)
+    I = None if columns.get("I") is None else np.broadcast_to(_finite("I", columns["I"]), T.shape)
+    check_conditions(T, pH, I)
+    conc = {s: np.broadcast_to(_positive(f"conc[{s}]", v), T.shape)
+            for s, v in _mapping("conc", columns.get("conc") or {}).items()}
+
+    names = columns.get("pair")
+    names, inverse = np.unique(np.broadcast_to(np.asarray(names, dtype=str), T.shape), return_inverse=True)
+    E, dG, exergy = (np.empty(T.shape) for _ in range(3))
+    for k, name in enumerate(names):
+        pair = PAIR_BY_NAME.get(str(name))
+        if pair is None:
+            raise ValueError(f"Unknown pair {str(name)!r}")
+        _check_species(pair, conc)
+        rows = inverse.reshape(T.shape) == k if len(names) > 1 else ...
+        E[rows], dG[rows], exergy[rows] = _evaluate_group(
+            pair, T[rows], pH[rows], {s: v[rows] for s, v in conc.items()},
+            None if I is None else I[rows], speciation, activity)
+    return {"E_V": E.tolist(), "dG_kJ": dG.tolist(), "exergy_H": _nan_to_none(exergy)}
+
+
+def warm_up():
+    """Builds the fraction tables and runs every kernel once so the first request is not the slow one."""
+    for system in speciation_model.PKA:
+        speciation_model.fraction_table(system)
+    evaluate([{"pair": pair.name, "environment": env.name} for pair in PAIRS for env in ENVIRONMENTS])
+    evaluate([{"pair": pair.name, "environment": env.name} for pair in PAIRS for env in ENVIRONMENTS],
+             speciation=True, activity="davies")
+
+
+class Metrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.requests = {}
+        self.errors = 0
+        self.conditions = 0
+        self.busy = 0.0   # seconds spent handling requests
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+
+    def record(self, path, seconds, conditions=0, error=False):
+        self.requests[path] = self.requests.get(path, 0) + 1
+        self.errors += error
+        self.conditions += conditions
+        self.busy += seconds
+        self.latencies.append(seconds)
+
+    def snapshot(self):
+        uptime = time.perf_counter() - self.started
+        latencies = np.array(self.latencies) * 1e6
+        percentiles = (dict(zip(("p50", "p90", "p99", "max"), np.percentile(latencies, [50, 90, 99, 100]).round(1)))
+                       if len(latencies) else {})
+        return {
+            "uptime_s": round(uptime, 3),
+            "requests": self.requests,
+            "errors": self.errors,
+            "conditions": self.conditions,
+            "latency_us": {key: float(value) for key, value in percentiles.items()},
+            "requests_per_s": round(sum(self.requests.values()) / uptime, 2),
+            # Throughput while busy: what the evaluation path sustains, independent of idle time
+            "conditions_per_busy_s": round(self.conditions / self.busy, 1) if self.busy else None,
+        }
+
+
+metrics = Metrics()
+
+
+def route(method, path, body):
+    """Returns (status, payload, conditions evaluated)."""
+    if path == "/evaluate":
+        if method != "POST":
+            return 405, {"error": "use POST"}, 0
+        request = _mapping("Body", json.loads(body or b"{}"))
+        options = request.get("speciation"), request.get("activity")
+        if options[0] not in (None, True, False):
+            raise ValueError('"speciation" must be true, false or null')
+        if options[1] is not None and options[1] not in activity_model.MODELS:
+            raise ValueError(f'"activity" must be one of {", ".join(activity_model.MODELS)}')
+        if isinstance(request.get("columns"), dict):
+            results = evaluate_columns(request["columns"], *options)
+            return 200, results, len(results["dG_kJ"])
+        if not isinstance(request.get("conditions"), list):
+            raise ValueError('Body must contain a "conditions" list or a "columns" object')
+        results = evaluate(request["conditions"], *options)
+        return 200, {"results": results}, len(results)
+    if method != "GET":
+        return 405, {"error": "use GET"}, 0
+    if path == "/pairs":
+        return 200, {"pairs": list(PAIR_BY_NAME), "environments": list(ENVIRONMENT_BY_NAME)}, 0
+    if path == "/metrics":
+        return 200, metrics.snapshot(), 0
+    if path == "/health":
+        return 200, {"status": "ok"}, 0
+    return 404, {"error": f"no route {path}"}, 0
+
+
+def respond(method, path, body):
+    """Returns (status, JSON bytes, conditions evaluated); every failure becomes an error response."""
+    try:
+        status, payload, conditions = route(method, path, body)
+        # allow_nan=False: a NaN that slipped through is an error, not invalid JSON
+        return status, json.dumps(payload, allow_nan=False).encode(), conditions
+    except KeyError as e:
+        status, payload = 400, {"error": f"missing {e}"}
+    except (ValueError, TypeError) as e:   # JSONDecodeError is a ValueError
+        status, payload = 400, {"error": str(e)}
+    except Exception as e:   # a bug, not a bad request: still answer rather than drop the connection
+        status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+    return status, json.dumps(payload).encode(), 0
+
+
+async def handle_connection(reader, writer):
+    # Minimal HTTP/1.1 with keep-alive: one request line, headers, optional JSON body
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+            headers = {}
+            while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                key, _, value = line.decode("latin-1").partition(":")
+                headers[key.strip().lower()] = value.strip()
+            try:
+                length = int(headers.get("content-length", 0))
+            except ValueError:
+                length = -1
+
+            start = time.perf_counter()
+            conditions = 0
+            keep_alive = headers.get("connection", "").lower() != "close"
+            if length < 0:
+                # Without a usable length the body cannot be skipped: answer and close
+                status, data = 400, json.dumps({"error": "invalid Content-Length"}).encode()
+                keep_alive = False
+            elif length > MAX_BODY:
+                # The unread body would be parsed as the next request: answer and close
+                status, data = 413, json.dumps({"error": f"body larger than {MAX_BODY} bytes"}).encode()
+                keep_alive = False
+            else:
+                body = await reader.readexactly(length) if length else b""
+                status, data, conditions = respond(method, target.split("?", 1)[0], body)
+            metrics.record(target.split("?", 1)[0], time.perf_counter() - start, conditions, status != 200)
+
+            writer.write(
+                f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data
+            )
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (asyncio.IncompleteReadError, ConnectionResetError, ValueError):
+        pass   # client went away or sent something that is not HTTP
+    finally:
+        writer.close()
+
+
+async def serve(host="127.0.0.1", port=8765):
+    warm_up()
+    server = await asyncio.start_server(handle_connection, host, port)
+    print(f"✅ Redox service listening on http://{host}:{port} ({len(PAIRS)} pairs, {len(ENVIRONMENTS)} environments)")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local HTTP/JSON service for batched ΔG queries.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
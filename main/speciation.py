@@ -0,0 +1,118 @@
+# speciation.py
+# Acid–base speciation of the dissolved carbon, sulfide and acetate pools.
+#
+# With speciation enabled, the concentration stored for CO2, H2S or CH3COO- in a
+# redox pair is read as the total of its acid–base system (e.g. total dissolved
+# inorganic carbon), and only the fraction present as that species enters Q.
+# At the pH 9 vent conditions most carbon is HCO3⁻ and most sulfide is HS⁻,
+# so this shifts ΔG by several kJ/mol.
+#
+# pKa(T) follows van 't Hoff from the 25 °C values. Fractions are tabulated once
+# per system as ln α over a pH × T grid and interpolated bilinearly; ln α is
+# nearly piecewise-linear in pH, so the interpolation error in ln α stays below
+# 3e-4 (0.03 % in α).
+#
+#   REDOX_SPECIATION=1 python main/main.py     # enable for a whole run
+#   pair.deltaG(T, pH, speciation=True)          # or per call
+
+import os
+import sys
+import math
+from functools import lru_cache
+
+import numpy as np
+
+if __name__ == "__main__":  # run as a script: resolve main.* from the repo root, not from main/ itself
+    sys.path[0] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+from main.thermodynamics import R
+
+ENABLED = os.environ.get("REDOX_SPECIATION", "0") not in ("", "0")
+
+T_REF = 298.15  # K
+LN10 = math.log(10)
+
+# Successive dissociation steps: (pKa at 25 °C, ΔH of ionization in kJ/mol)
+PKA = {
+    "carbonate": [(6.35, 9.15), (10.33, 14.85)],   # CO2(aq)/HCO3⁻, HCO3⁻/CO3²⁻
+    "sulfide": [(7.02, 22.2)],                     # H2S/HS⁻ (HS⁻/S²⁻ is negligible below pH 14)
+    "acetate": [(4.76, -0.41)],                    # CH3COOH/CH3COO⁻
+}
+
+# Species name as used in data.py -> (system, protons removed from the fully protonated form)
+SPECIES = {
+    "CO2": ("carbonate", 0),
+    "HCO3-": ("carbonate", 1),
+    "CO3^2-": ("carbonate", 2),
+    "H2S": ("sulfide", 0),
+    "HS-": ("sulfide", 1),
+    "CH3COOH": ("acetate", 0),
+    "CH3COO-": ("acetate", 1),
+}
+
+# Fraction table grid
+PH_GRID = np.linspace(0.0, 14.0, 701)       # 0.02 pH steps
+T_GRID = np.linspace(273.15, 473.15, 101)   # 2 K steps
+
+
+def pKa(system, T):
+    """pKa of each dissociation step at T (K); shape (steps,) + shape(T)."""
+    T = np.asarray(T, dtype=float)
+    return np.stack([pKa25 + dH * 1000 / (R * LN10) * (1 / T - 1 / T_REF) for pKa25, dH in PKA[system]])
+
+
+def ln_fractions_exact(system, pH, T):
+    """ln α of every protonation state, shape (states,) + broadcast(pH, T)."""
+    pH, T = np.broadcast_arrays(np.asarray(pH, dtype=float), np.asarray(T, dtype=float))
+    ln_Ka = -LN10 * pKa(system, T)
+    ln_H = -LN10 * pH
+    steps = len(PKA[system])
+    # State k: [H⁺]^(steps-k) · Ka1···Ka_k, normalized over all states
+    terms = [(steps - k) * ln_H + ln_Ka[:k].sum(axis=0) for k in range(steps + 1)]
+    terms = np.stack(terms)
+    peak = terms.max(axis=0)
+    return terms - (peak + np.log(np.exp(terms - peak).sum(axis=0)))
+
+
+@lru_cache(maxsize=None)
+def fraction_table(system):
+    """ln α of every state tabulated over PH_GRID × T_GRID (built on first use)."""
+    pH, T = np.meshgrid(PH_GRID, T_GRID, indexing="ij")
+    table = ln_fractions_exact(system, pH, T)
+    table.flags.writeable = False
+    return table
+
+
+def ln_fraction(species, pH, T):
+    """
+    ln of the fraction of its acid–base system present as species, interpolated
+    from the fraction table; points off the grid are computed exactly.
+    """
+    system, state = SPECIES[species]
+    pH, T = np.broadcast_arrays(np.asarray(pH, dtype=float), np.asarray(T, dtype=float))
+    table = fraction_table(system)[state]
+
+    x = (pH - PH_GRID[0]) / (PH_GRID[1] - PH_GRID[0])
+    y = (T - T_GRID[0]) / (T_GRID[1] - T_GRID[0])
+    i = np.clip(np.floor(x).astype(np.intp), 0, len(PH_GRID) - 2)
+    j = np.clip(np.floor(y).astype(np.intp), 0, len(T_GRID) - 2)
+    fx, fy = x - i, y - j
+    result = ((1 - fx) * ((1 - fy) * table[i, j] + fy * table[i, j + 1])
+              + fx * ((1 - fy) * table[i + 1, j] + fy * table[i + 1, j + 1]))
+
+    outside = (fx < 0) | (fx > 1) | (fy < 0) | (fy > 1)
+    if outside.any():
+        result = np.array(result)
+        result[outside] = ln_fractions_exact(system, pH[outside], T[outside])[state]
+    return result
+
+
+def fraction(species, pH, T):
+    """Fraction (0–1) of the total present as species."""
+    return np.exp(ln_fraction(species, pH, T))
+
+
+if __name__ == "__main__":
+    for species in SPECIES:
+        alpha = fraction(species, [5.5, 7.0, 9.0], [313.15, 323.15, 343.15])
+        print(f"{species:<8} α at pH 5.5 / 7 / 9: " + ", ".join(f"{a:.3g}" for a in alpha))
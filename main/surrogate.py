@@ -0,0 +1,287 @@
+# surrogate.py
+# Precomputed ΔG tables for repeated lookups over a fixed (T, pH, log c) domain.
+#
+# A surrogate tabulates one pair's ΔG on a regular grid and answers queries by
+# trilinear interpolation. The grid is refined until the interpolation error
+# bound is within tol (J/mol). The bound is twice the larger of the
+# tensor-product interpolation estimate, h²/8 · max|∂²ΔG/∂x²| per axis taken
+# from second differences of the table, and the largest error measured against
+# the exact kernel at every cell center; the factor covers curvature the
+# sampled differences miss.
+#
+# Tables are saved as .npy next to a JSON header and memory-mapped on load, so
+# a dashboard or optimizer process starts without recomputing them.
+#
+# log c shifts every reactant except H⁺ by 10^log_c from its stored value (unit
+# activity where none is stored; same as optimize.py --ties). The
+# speciation/activity settings in force at build time are part of the table's
+# identity, so changing them builds a new table. Saving a table deletes the
+# pair's tables it supersedes (same options, older pair data or format);
+# `python main/surrogate.py --prune` also drops tables for other options.
+#
+#   from main.surrogate import get_surrogate
+#   table = get_surrogate(pair)                # load from surrogates/ or build once
+#   dG = table.deltaG(T, pH, log_c)            # J/mol, vectorized
+
+import os
+import sys
+import re
+import json
+import hashlib
+import argparse
+
+import numpy as np
+
+if __name__ == "__main__":  # run as a script: resolve main.* from the repo root, not from main/ itself
+    sys.path[0] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+from main.records import as_pair
+import main.speciation as speciation_model
+import main.activity as activity_model
+from main.instrumentation import timed, count
+
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+surrogate_dir = os.path.join(root_dir, "surrogates")
+
+FORMAT_VERSION = 1
+AXES = ("T", "pH", "log_c")
+DEFAULT_DOMAIN = {"T": (273.15, 423.15), "pH": (0.0, 14.0), "log_c": (-6.0, 3.0)}
+INITIAL_STEPS = 9
+SAFETY = 2.0
+MAX_POINTS = 1 << 24   # 128 MB of float64 per pair
+
+
+def safe_filename(name):
+    return name.replace("/", "_").replace("^", "").replace("+", "p").replace("-", "m")
+
+
+def _exact(pair, T, pH, log_c, settings):
+    scale = 10.0 ** np.asarray(log_c, dtype=float)
+    conc = {species: pair.conc.get(species, 1.0) * scale for species in pair.reactants if species != "H+"}
+    dG = pair.deltaG(T, pH, conc or None, speciation=settings["speciation"],
+                     I=settings["ionic_strength"], activity=settings["activity"])
+    return np.broadcast_to(dG, np.broadcast_shapes(np.shape(T), np.shape(pH), np.shape(log_c)))
+
+
+def _axis_bounds(values):
+    """h²/8 · max|f''| per axis, from second differences (h² cancels)."""
+    return [np.abs(np.diff(values, n=2, axis=axis)).max() / 8 if values.shape[axis] > 2 else np.inf
+            for axis in range(values.ndim)]
+
+
+def _center_error(pair, grids, values, settings):
+    """Largest |exact − interpolated| over all cell centers (where the interpolant is the corner mean)."""
+    mids = [(grid[:-1] + grid[1:]) / 2 for grid in grids]
+    corners = sum(values[a:a + len(mids[0]), b:b + len(mids[1]), c:c + len(mids[2])]
+                  for a in (0, 1) for b in (0, 1) for c in (0, 1)) / 8
+    exact = _exact(pair, mids[0][:, None, None], mids[1][None, :, None], mids[2][None, None, :], settings)
+    return float(np.abs(exact - corners).max())
+
+
+class Surrogate:
+    """Trilinear ΔG table for one pair; values may be a read-only memory map."""
+
+    def __init__(self, header, values):
+        self.header = header
+        self.name = header["pair"]
+        self.error_bound = header["error_bound"]
+        self.grids = [np.linspace(*header["domain"][axis], header["steps"][axis]) for axis in AXES]
+        self.values = values
+
+    def deltaG(self, T, pH, log_c=0.0):
+        """ΔG (J/mol) at any broadcastable T, pH, log c inside the domain; error ≤ error_bound."""
+        points = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (T, pH, log_c)))
+        index, weight = [], []
+        for axis, x, grid in zip(AXES, points, self.grids):
+            last = len(grid) - 1
+            pos = (x - grid[0]) / (grid[1] - grid[0])
+            if pos.size and (pos.min() < -1e-9 * last or pos.max() > last * (1 + 1e-9)):
+                raise ValueError(f"{self.name}: {axis} outside the surrogate domain [{grid[0]:g}, {grid[-1]:g}]")
+            i = np.minimum(pos.astype(np.intp), last - 1)
+            index.append(i)
+            weight.append(pos - i)
+        (i, j, k), (wx, wy, wz) = index, weight
+        count("surrogate lookup", points[0].size)
+
+        # Gather the 8 cell corners from the flat table
+        flat = self.values.reshape(-1)
+        _, ny, nz = self.values.shape
+        base = (i * ny + j) * nz + k
+
+        def edge(di, dj):
+            # Interpolated along log c between corners (i+di, j+dj, k) and (…, k+1)
+            lo = np.take(flat, base + (di * ny + dj) * nz)
+            return lo + wz * (np.take(flat, base + ((di * ny + dj) * nz + 1)) - lo)
+
+        c00, c01, c10, c11 = edge(0, 0), edge(0, 1), edge(1, 0), edge(1, 1)
+        c0 = c00 + wy * (c01 - c00)
+        c1 = c10 + wy * (c11 - c10)
+        return c0 + wx * (c1 - c0)
+
+    def save(self, stem):
+        # The header goes last: a stem with a .json is only ever a complete table
+        _replace(f"{stem}.npy", lambda f: np.save(f, np.ascontiguousarray(self.values)))
+        _replace(f"{stem}.json", lambda f: f.write(json.dumps(self.header, indent=2).encode("utf-8")))
+
+    @classmethod
+    def load(cls, stem, mmap=True):
+        """Loads a saved table; raises ValueError if the files do not form a complete table."""
+        with open(f"{stem}.json", encoding="utf-8") as f:
+            header = json.load(f)
+        values = np.load(f"{stem}.npy", mmap_mode="r" if mmap else None)
+        if not isinstance(header, dict) or values.shape != tuple(header["steps"][axis] for axis in AXES):
+            raise ValueError(f"{stem}: table does not match its header")
+        return cls(header, values)
+
+
+def _replace(path, write):
+    """Writes path through a temporary file in the same directory, then renames it into place."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def _settings(speciation=None, activity=None, ionic_strength=None):
+    return {
+        "speciation": speciation_model.ENABLED if speciation is None else bool(speciation),
+        "activity": activity_model.MODEL if activity is None else activity,
+        "ionic_strength": ionic_strength,
+    }
+
+
+def fingerprint(pair, domain, tol, settings):
+    """Hash of everything the table depends on; a stored table is reused only if it matches."""
+    key = {
+        "version": FORMAT_VERSION,
+        "pair": [pair.name, pair.E0, pair.n, dict(pair.stoich), dict(pair.conc), dict(pair.charges)],
+        "domain": domain,
+        "tol": tol,
+        "settings": settings,
+    }
+    return hashlib.sha1(json.dumps(key, sort_keys=True).encode()).hexdigest()[:12]
+
+
+@timed()
+def build_surrogate(pair, domain=None, tol=1.0, speciation=None, activity=None, ionic_strength=None):
+    """
+    Tabulates ΔG over domain (axis -> (start, stop)), refining the axis with the
+    largest error contribution until the error bound is ≤ tol (J/mol).
+    """
+    pair = as_pair(pair)
+    domain = {**DEFAULT_DOMAIN, **(domain or {})}
+    settings = _settings(speciation, activity, ionic_strength)
+    steps = dict.fromkeys(AXES, INITIAL_STEPS)
+
+    while True:
+        grids = [np.linspace(*domain[axis], steps[axis]) for axis in AXES]
+        values = _exact(pair, grids[0][:, None, None], grids[1][None, :, None], grids[2][None, None, :], settings)
+        count("build_surrogate", values.size)
+        axis_bounds = _axis_bounds(values)
+        # Floor: float64 rounding of ΔG itself
+        error_bound = SAFETY * max(sum(axis_bounds), _center_error(pair, grids, values, settings),
+                                   1e-12 * float(np.abs(values).max()))
+        if error_bound <= tol:
+            break
+        worst = AXES[int(np.argmax(axis_bounds))]
+        steps[worst] = 2 * steps[worst] - 1   # halves the spacing and keeps every node
+        if np.prod(list(steps.values())) > MAX_POINTS:
+            raise ValueError(f"{pair.name}: cannot reach tol={tol} J/mol within {MAX_POINTS} grid points")
+
+    header = {
+        "version": FORMAT_VERSION,
+        "pair": pair.name,
+        "domain": {axis: list(domain[axis]) for axis in AXES},
+        "steps": steps,
+        "tol": tol,
+        "error_bound": error_bound,
+        "settings": settings,
+        "fingerprint": fingerprint(pair, domain, tol, settings),
+    }
+    return Surrogate(header, np.ascontiguousarray(values))
+
+
+def get_surrogate(pair, directory=surrogate_dir, rebuild=False, **options):
+    """Loads the pair's table from directory (memory-mapped), building and saving it first if needed."""
+    pair = as_pair(pair)
+    domain = {**DEFAULT_DOMAIN, **(options.get("domain") or {})}
+    settings = _settings(options.get("speciation"), options.get("activity"), options.get("ionic_strength"))
+    key = fingerprint(pair, domain, options.get("tol", 1.0), settings)
+    stem = os.path.join(directory, f"{safe_filename(pair.name)}_{key}")
+
+    if not rebuild and os.path.exists(f"{stem}.npy") and os.path.exists(f"{stem}.json"):
+        try:
+            table = Surrogate.load(stem)
+            if table.header.get("fingerprint") == key:
+                return table
+        except (OSError, ValueError, KeyError, TypeError):
+            pass  # truncated or foreign files (e.g. an interrupted save): rebuild below
+        print(f"⚠️ Rebuilding unreadable surrogate table {stem}")
+    os.makedirs(directory, exist_ok=True)
+    table = build_surrogate(pair, **options)
+    table.save(stem)
+    remove_superseded(pair, table.header, directory)
+    return Surrogate.load(stem)
+
+
+def table_stems(directory, pair=None):
+    """Stems of the tables in directory (of pair only, if given) that have a header."""
+    prefix = re.escape(safe_filename(pair.name)) if pair is not None else r".+"
+    pattern = re.compile(prefix + r"_[0-9a-f]{12}\.json")
+    names = os.listdir(directory) if os.path.isdir(directory) else []
+    return sorted(os.path.join(directory, name[:-5]) for name in names if pattern.fullmatch(name))
+
+
+def remove_table(stem):
+    # Header first: a stem without one is never loaded
+    for path in (f"{stem}.json", f"{stem}.npy"):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def remove_superseded(pair, header, directory=surrogate_dir):
+    """Deletes pair's other tables built with the same domain, tol and settings (or unreadable)."""
+    same = ("domain", "tol", "settings")
+    for stem in table_stems(directory, as_pair(pair)):
+        if stem.endswith(header["fingerprint"]):
+            continue
+        try:
+            with open(f"{stem}.json", encoding="utf-8") as f:
+                old = json.load(f)
+            superseded = all(old.get(key) == header[key] for key in same)
+        except (OSError, ValueError, AttributeError):
+            superseded = True
+        if superseded:
+            remove_table(stem)
+
+
+if __name__ == "__main__":
+    from main.records import PAIRS
+
+    parser = argparse.ArgumentParser(description="Build the default surrogate table of every pair.")
+    parser.add_argument("--prune", action="store_true",
+                        help="instead delete every table in surrogates/ except the current defaults")
+    args = parser.parse_args()
+
+    if args.prune:
+        settings = _settings()
+        keep = {f"{safe_filename(pair.name)}_{fingerprint(pair, DEFAULT_DOMAIN, 1.0, settings)}" for pair in PAIRS}
+        stale = [stem for stem in table_stems(surrogate_dir) if os.path.basename(stem) not in keep]
+        for stem in stale:
+            remove_table(stem)
+        # Data files whose header is gone (interrupted saves)
+        for name in os.listdir(surrogate_dir) if os.path.isdir(surrogate_dir) else []:
+            if name.endswith(".npy") and not os.path.exists(os.path.join(surrogate_dir, name[:-4] + ".json")):
+                os.remove(os.path.join(surrogate_dir, name))
+        print(f"✅ Removed {len(stale)} surrogate tables from {surrogate_dir}")
+        raise SystemExit
+
+    for pair in PAIRS:
+        table = get_surrogate(pair, rebuild=True)
+        steps = " × ".join(str(table.header["steps"][axis]) for axis in AXES)
+        print(f"✅ {pair.name:<12} {steps:>14} points, error ≤ {table.error_bound:.3g} J/mol")
@@ -0,0 +1,144 @@
+# table_export.py
+# Shared LaTeX table writer used by the main, optimization and sensitivity table scripts.
+# Columns are formatted as whole arrays, rows are joined in one pass and written
+# through a single large buffer (one write per chunk when streaming).
+
+import os
+import numpy as np
+import pandas as pd
+
+from main.instrumentation import timed, record_file
+from main.artifacts import write_text
+
+ROW_END = " \\\\ \n"
+
+
+def tex_escape(values):
+    return pd.Series(values).astype(str).str.replace("_", "\\_", regex=False)
+
+
+def format_column(values, fmt=None, na=None):
+    """
+    Formats a column to strings in one vectorized call.
+
+    fmt may be a printf-style format ("%.3f"), a callable taking and returning
+    a Series, or None for plain str(). If na is given, missing values are
+    rendered as na instead of "nan".
+    """
+    values = pd.Series(values).reset_index(drop=True)
+    if fmt is None:
+        out = values.astype(str)
+    elif callable(fmt):
+        out = pd.Series(fmt(values)).reset_index(drop=True).astype(str)
+    else:
+        out = pd.Series(np.char.mod(fmt, values.to_numpy(dtype=float)), dtype=object)
+    if na is not None:
+        out = out.where(values.notna(), na)
+    return out
+
+
+def format_rows(df, columns):
+    """Builds the LaTeX row strings for df; columns is a list of (column, fmt[, na]) tuples."""
+    if df.empty:
+        return ""
+    cells = [format_column(df[spec[0]], *spec[1:]) for spec in columns]
+    rows = cells[0].str.cat(cells[1:], sep=" & ") + ROW_END
+    return "".join(rows.tolist())
+
+
+def table_head(col_spec, header, longtable=False):
+    env = "longtable" if longtable else "tabular"
+    head = f"\\begin{{{env}}}{{{col_spec}}}\n\\toprule\n{header}\\midrule\n"
+    if longtable:
+        head += "\\endhead\n\\bottomrule\n\\endlastfoot\n"
+    return head
+
+
+def table_foot(longtable=False):
+    if longtable:
+        return "\\end{longtable}\n"
+    return "\\bottomrule\n\\end{tabular}\n"
+
+
+class DeferredFile:
+    """File-like buffer that hands the finished text to the background writer on close."""
+
+    def __init__(self, path):
+        self.path = path
+        self.parts = []
+
+    def write(self, text):
+        self.parts.append(text)
+
+    def close(self):
+        if self.parts is not None:
+            write_text(self.path, "".join(self.parts))
+            self.parts = None
+
+
+def part_path(tex_path, index):
+    stem, ext = os.path.splitext(tex_path)
+    return f"{stem}_part{index:02d}{ext}"
+
+
+@timed()
+def write_latex_table(data, tex_path, columns, col_spec, header, longtable=False, rows_per_file=None):
+    """
+    Writes a booktabs LaTeX table and returns the list of files written.
+
+    data is a DataFrame or an iterable of DataFrame chunks (for example
+    pd.read_csv(..., chunksize=...)); chunks are formatted and written one at
+    a time so the full table never has to be held in memory. A DataFrame is
+    already in memory, so its files are assembled and queued on the
+    background writer instead (see artifacts.flush). header is the complete
+    column-title line including its row terminator.
+
+    With rows_per_file set, the table is split into self-contained files
+    named <stem>_partNN.tex.
+    """
+    in_memory = isinstance(data, pd.DataFrame)
+    chunks = [data] if in_memory else data
+    os.makedirs(os.path.dirname(os.path.abspath(tex_path)), exist_ok=True)
+
+    head = table_head(col_spec, header, longtable)
+    foot = table_foot(longtable)
+    written = []
+
+    def next_file(previous):
+        if previous is not None:
+            previous.write(foot)
+            previous.close()
+        path = tex_path if rows_per_file is None else part_path(tex_path, len(written) + 1)
+        written.append(path)
+        handle = DeferredFile(path) if in_memory else open(path, "w", encoding="utf-8", buffering=1 << 20)
+        handle.write(head)
+        return handle
+
+    f = None
+    rows_in_file = 0
+    try:
+        for chunk in chunks:
+            start = 0
+            while start < len(chunk):
+                if f is None or rows_in_file == rows_per_file:
+                    f = next_file(f)
+                    rows_in_file = 0
+                stop = len(chunk)
+                if rows_per_file is not None:
+                    stop = min(stop, start + rows_per_file - rows_in_file)
+                f.write(format_rows(chunk.iloc[start:stop], columns))
+                rows_in_file += stop - start
+                start = stop
+        if f is None:
+            f = next_file(None)
+        f.write(foot)
+        f.close()
+        f = None
+    finally:
+        # a failed in-memory table is dropped rather than queued half-written
+        if f is not None and not in_memory:
+            f.close()
+    if not in_memory:
+        for path in written:
+            record_file("write_latex_table", path)
+    return written
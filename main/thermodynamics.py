@@ -1,18 +1,56 @@
 import math
+import importlib
 
 # Constants
 F = 96485.3329  # Faraday's constant (C/mol)
 R = 8.3145      # Universal gas constant (J/mol·K)
 
+_models = {}  # speciation / activity modules, imported on first use (they import R from here)
+
+
+def _model(name):
+    if name not in _models:
+        _models[name] = importlib.import_module(f"main.{name}")
+    return _models[name]
+
+
+def calculate_Q(pair, T=298.15, speciation=None, I=None, activity=None):
+    """
+    Reaction quotient from the pair's concentrations.
+
+    With speciation (default: speciation.ENABLED), CO2, H2S and acetate
+    concentrations are totals of their acid–base systems and only the active
+    fraction at the pair's [H+] and temperature T (K) is used. Given an ionic
+    strength I (mol/L), charged species other than H+ are corrected to
+    activities with the activity model (default: activity.MODEL).
+    """
+    speciation_model = _model("speciation")
+    if speciation is None:
+        speciation = speciation_model.ENABLED
+    pH = -math.log10(pair["conc"].get("H+", 1e-7))
+
+    def active(species):
+        conc = pair["conc"].get(species, 1)
+        if speciation and species in speciation_model.SPECIES:
+            conc *= float(speciation_model.fraction(species, pH, T))
+        return conc
 
-def calculate_Q(pair):
     Q = 1.0
     for species, coeff in pair["products"].items():
-        conc = pair["conc"].get(species, 1)
-        Q *= conc ** coeff
+        Q *= active(species) ** coeff
     for species, coeff in pair["reactants"].items():
-        conc = pair["conc"].get(species, 1)
-        Q /= conc ** coeff
+        Q /= active(species) ** coeff
+
+    if I is not None and pair.get("charges"):
+        activity_model = _model("activity")
+        terms = []
+        for sign, side in ((1, pair["products"]), (-1, pair["reactants"])):
+            for species, coeff in side.items():
+                charge = pair["charges"].get(species, 0)
+                if charge and species != "H+":
+                    size = activity_model.ION_SIZE.get(species, activity_model.DEFAULT_ION_SIZE)
+                    terms.append((sign * coeff, charge, size))
+        Q *= math.exp(float(activity_model.ln_gamma_sum(tuple(terms), I, T, activity)))
     return Q
 
 
@@ -2,26 +2,37 @@
 # and generates a LaTeX-formatted table for Overleaf integration.
 
 import os
+import sys
 import pandas as pd
 
-def generate_latex_table():
-    csv_path = "optimization/optimal_conditions.csv"
-    tex_path = "report/tables/table_optimal_conditions.tex"
-    os.makedirs(os.path.dirname(tex_path), exist_ok=True)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from main.table_export import write_latex_table
+from main.instrumentation import timed
 
+base_dir = os.path.dirname(__file__)
+csv_path = os.path.join(base_dir, "optimal_conditions.csv")
+tex_path = os.path.join(base_dir, "../report/tables/table_optimal_conditions.tex")
+
+COLUMNS = [
+    ("Redox Pair", None),
+    ("T (K)", None),
+    ("pH", None),
+    ("Exergy Efficiency (%)", None),
+]
+
+@timed("generate_optimal_table")
+def generate_latex_table(csv_path=csv_path, tex_path=tex_path, longtable=False, rows_per_file=None):
     df = pd.read_csv(csv_path)
 
-    with open(tex_path, "w") as f:
-        f.write("\\begin{tabular}{lccc}\n")
-        f.write("\\toprule\n")
-        f.write("Redox Pair & Temperature (K) & pH & Exergy Efficiency (\\%) \\\\ \n")
-        f.write("\\midrule\n")
-        for _, row in df.iterrows():
-            f.write(f"{row['Redox Pair']} & {row['T (K)']} & {row['pH']} & {row['Exergy Efficiency (%)']} \\\\ \n")
-        f.write("\\bottomrule\n")
-        f.write("\\end{tabular}\n")
-
-    print(f"LaTeX table written to {tex_path}")
+    written = write_latex_table(
+        df, tex_path, COLUMNS,
+        col_spec="lccc",
+        header="Redox Pair & Temperature (K) & pH & Exergy Efficiency (\\%) \\\\ \n",
+        longtable=longtable,
+        rows_per_file=rows_per_file,
+    )
+
+    print(f"LaTeX table written to {', '.join(written)}")
 
 if __name__ == "__main__":
     generate_latex_table()
@@ -1,62 +1,201 @@
 # optimize.py — runs optimization and generates summary table + plots
 import sys
 import os
+import argparse
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import pandas as pd
 import numpy as np
-from main.thermodynamics import (
-    calculate_Q,
-    adjust_E0,
-    calculate_deltaG,
-    calculate_exergy_efficiency_from_H
-)
-from main.data import redox_pairs
-
-# Output path
+from main.records import PAIRS, as_pair
+from main.activity import MAX_IONIC_STRENGTH
+from main.instrumentation import timed, stage, count, timed_write
+from main.artifacts import flush, set_render_profile
+from main.result_store import ResultStore
+from main.surrogate import get_surrogate
+from main.parallel import map_into
+
+# Output paths
 csv_path = os.path.join(os.path.dirname(__file__), "optimal_conditions.csv")
+ties_path = os.path.join(os.path.dirname(__file__), "efficiency_ties.csv")
+
+# Efficiencies closer than this (percentage points) count as tied
+TIE_TOL = 1e-9
+# Grid points evaluated per batch in the --ties search (bounds peak memory),
+# and tied points kept per pair
+TIES_CHUNK = 1 << 18
+TIES_TOP = 100
 
-def optimize_environment_for_redox(pair, temp_range=(300, 373), pH_range=(5, 9), steps=20):
-    best_result = None
-    best_eff = -np.inf
+# Search domain of the single-objective optimization
+TEMP_RANGE = (300, 373)
+PH_RANGE = (5, 9)
+STEPS = 20
 
-    delta_H = pair['delta_H']
-    if abs(delta_H) < 1e-8:
+def best_conditions(pair, T_values, pH_values, dG, ex_eff):
+    """
+    Row of the grid point with maximum efficiency. Where several points tie
+    (typically at the 100 % cap) the one with the largest driving force (−ΔG)
+    wins; "Tied Points" counts them (see --ties for the whole set).
+    """
+    tied = ex_eff >= np.nanmax(ex_eff) - TIE_TOL
+    i, j = np.unravel_index(np.argmin(np.where(tied, dG, np.inf)), ex_eff.shape)
+    return {
+        "Redox Pair": pair.name,
+        "T (K)": round(float(T_values[i]), 2),
+        "pH": round(float(pH_values[j]), 2),
+        "ΔG (kJ/mol)": round(float(dG[i, j]) / 1000, 2),
+        "Exergy Efficiency (%)": round(float(ex_eff[i, j]), 2),
+        "Tied Points": int(tied.sum())
+    }
+
+@timed()
+def optimize_environment_for_redox(pair, temp_range=TEMP_RANGE, pH_range=PH_RANGE, steps=STEPS, surrogate=None,
+                                   ionic_strength=None):
+    """
+    Grid search for maximum exergy efficiency; surrogate (main.surrogate) replaces the exact ΔG kernel.
+    Given an ionic strength, charged species enter as activities (main.activity).
+    """
+    pair = as_pair(pair)
+    if abs(pair.delta_H) < 1e-8:
         return None  # Skip this pair (e.g., H₂/H⁺) if ΔH is zero
 
     T_values = np.linspace(*temp_range, steps)
     pH_values = np.linspace(*pH_range, steps)
+    count("optimize_environment_for_redox", steps * steps)
+
+    # Whole (T, pH) grid at once; rows follow T, columns follow pH
+    T_grid, pH_grid = np.meshgrid(T_values, pH_values, indexing="ij")
+    if surrogate is None:
+        dG = pair.deltaG(T_grid, pH_grid, I=ionic_strength)
+    else:
+        dG = surrogate.deltaG(T_grid, pH_grid)
+    ex_eff = pair.exergy_efficiency_H(dG)
+    return best_conditions(pair, T_values, pH_values, dG, ex_eff)
+
+def _optimize_into(arrays, p, use_surrogate, ionic_strength):
+    # Pool task: ΔG and efficiency of PAIRS[p] over the shared (T, pH) grid, written into row p
+    pair = PAIRS[p]
+    T, pH = arrays["T"][:, None], arrays["pH"][None, :]
+    if use_surrogate:
+        dG = get_surrogate(pair, ionic_strength=ionic_strength).deltaG(T, pH)
+    else:
+        dG = pair.deltaG(T, pH, I=ionic_strength)
+    arrays["dG"][p] = dG
+    arrays["ex_eff"][p] = pair.exergy_efficiency_H(dG)
+
+@timed()
+def efficiency_ties_for_redox(pair, temp_range=(300, 373), pH_range=(5, 9), log_c_range=(-2, 2),
+                              steps=100, top=TIES_TOP, chunk=TIES_CHUNK, surrogate=None, ionic_strength=None):
+    """
+    Grid points tied at the maximum ΔH-based exergy efficiency over a
+    (T, pH, reactant concentration) grid of steps³ points, ranked by driving
+    force (−ΔG, largest first). Only the first top points are returned (None
+    for all); "Tied Points" gives the size of the whole tied set.
+
+    Efficiency is a clipped, monotone function of ΔG, so it does not trade off
+    against −ΔG: it only plateaus, mostly at the 100 % cap, and the points on
+    that plateau are what a single argmax discards. The concentration axis
+    shifts every reactant except H⁺ by 10^log_c from its stored value (unit
+    activity where none is stored). The grid is evaluated in chunks, keeping
+    only each chunk's best top ties, so memory stays O(chunk + top). A surrogate
+    (main.surrogate, same log c convention) replaces the exact ΔG kernel; the
+    ionic strength is passed to the exact kernel (main.activity).
+    Returns None when ΔH = 0 (efficiency undefined).
+    """
+    pair = as_pair(pair)
+    if abs(pair.delta_H) < 1e-8:
+        return None
+
+    T_values = np.linspace(*temp_range, steps)
+    pH_values = np.linspace(*pH_range, steps)
+    log_c_values = np.linspace(*log_c_range, steps)
+    reactants = [species for species in pair.reactants if species != "H+"]
+    shape = (steps, steps, steps)
+    total = steps ** 3
+    count("efficiency_ties_for_redox", total)
+
+    best, tied, candidates = -np.inf, 0, []
+    for start in range(0, total, chunk):
+        flat = np.arange(start, min(start + chunk, total))
+        i, j, k = np.unravel_index(flat, shape)
+        if surrogate is None:
+            scale = 10.0 ** log_c_values[k]
+            conc = {species: pair.conc.get(species, 1.0) * scale for species in reactants}
+            dG = pair.deltaG(T_values[i], pH_values[j], conc, I=ionic_strength)
+        else:
+            dG = surrogate.deltaG(T_values[i], pH_values[j], log_c_values[k])
+        ex_eff = pair.exergy_efficiency_H(dG)
+
+        chunk_best = ex_eff.max()
+        if chunk_best > best + TIE_TOL:
+            best, tied, candidates = chunk_best, 0, []   # new maximum: earlier ties are out
+        elif chunk_best < best - TIE_TOL:
+            continue
+        keep = np.flatnonzero(ex_eff >= best - TIE_TOL)
+        tied += keep.size
+        if top is not None and keep.size > top:
+            keep = keep[np.lexsort((keep, dG[keep]))[:top]]   # same order as the final ranking
+        candidates.append((flat[keep], dG[keep]))
+
+    flat, dG = (np.concatenate(parts) for parts in zip(*candidates))
+    order = np.lexsort((flat, dG))[:top]   # most negative ΔG first, then grid order
+    flat, dG = flat[order], dG[order]
+    i, j, k = np.unravel_index(flat, shape)
+    return pd.DataFrame({
+        "Redox Pair": pair.name,
+        "T (K)": np.round(T_values[i], 2),
+        "pH": np.round(pH_values[j], 2),
+        "log c shift": np.round(log_c_values[k], 3),
+        "ΔG (kJ/mol)": np.round(dG / 1000, 2),
+        "Exergy Efficiency (%)": np.round(pair.exergy_efficiency_H(dG), 2),
+        "Tied Points": tied
+    })
+
+@timed()
+def run_ties_for_all(steps=100, top=TIES_TOP, store=None, use_surrogates=False, ionic_strength=None):
+    sets = []
+    for pair in PAIRS:
+        surrogate = get_surrogate(pair, ionic_strength=ionic_strength) if use_surrogates else None
+        ties = efficiency_ties_for_redox(pair, steps=steps, top=top, surrogate=surrogate,
+                                         ionic_strength=ionic_strength)
+        if ties is None:
+            print(f"⚠️ Skipping {pair['name']} — exergy undefined (ΔH = 0)")
+            continue
+        sets.append(ties)
+        print(f"Maximum efficiency for {pair['name']}: {ties['Tied Points'].iloc[0]} of {steps ** 3} points tied")
+
+    if sets:
+        df = pd.concat(sets, ignore_index=True)
+        with timed_write(ties_path):
+            df.to_csv(ties_path, index=False)
+        if store is not None:
+            store.add(store.start_run("efficiency_ties"), "efficiency_ties", df)
+        print(f"\n✅ Maximum-efficiency ties saved to {ties_path}.")
+    else:
+        print("❌ No valid results to save.")
+
+@timed()
+def run_optimization_for_all(store=None, use_surrogates=False, workers=None, ionic_strength=None):
+    T_values = np.linspace(*TEMP_RANGE, STEPS)
+    pH_values = np.linspace(*PH_RANGE, STEPS)
+    defined = [p for p, pair in enumerate(PAIRS) if abs(pair.delta_H) >= 1e-8]  # ΔH = 0 has no efficiency
+    if use_surrogates:
+        for p in defined:
+            get_surrogate(PAIRS[p], ionic_strength=ionic_strength)  # built here once, then memory-mapped by every worker
+
+    # One task per pair; results land in the preallocated (pairs, T, pH) arrays
+    shape = (len(PAIRS), STEPS, STEPS)
+    with stage("optimization grid compute"):
+        grids = map_into(_optimize_into, [(p, use_surrogates, ionic_strength) for p in defined],
+                         outputs={"dG": (shape, float), "ex_eff": (shape, float)},
+                         inputs={"T": T_values, "pH": pH_values}, workers=workers)
+    count("optimization grid compute", len(defined) * STEPS * STEPS)
 
-    for T in T_values:
-        for pH in pH_values:
-            conc = pair["conc"].copy()
-            if "H+" in conc:
-                conc["H+"] = 10 ** (-pH)
-
-            Q = calculate_Q({**pair, "conc": conc})
-            E = adjust_E0(pair['E0'], pair['n'], T, Q)
-            dG = calculate_deltaG(E, pair['n'])
-            ex_eff = calculate_exergy_efficiency_from_H(dG, delta_H)
-
-            if ex_eff > best_eff:
-                best_eff = ex_eff
-                best_result = {
-                    "Redox Pair": pair['name'],
-                    "T (K)": round(T, 2),
-                    "pH": round(pH, 2),
-                    "ΔG (kJ/mol)": round(dG / 1000, 2),
-                    "Exergy Efficiency (%)": round(ex_eff, 2)
-                }
-
-    return best_result
-
-def run_optimization_for_all():
     all_results = []
-    for pair in redox_pairs:
-        result = optimize_environment_for_redox(pair)
-        if result is None:
+    for p, pair in enumerate(PAIRS):
+        if p not in defined:
             print(f"⚠️ Skipping {pair['name']} — exergy undefined (ΔH = 0)")
             continue
+        result = best_conditions(pair, T_values, pH_values, grids["dG"][p], grids["ex_eff"][p])
         all_results.append(result)
         print(f"Best conditions for: {result['Redox Pair']}")
         for k, v in result.items():
@@ -66,17 +205,49 @@ def run_optimization_for_all():
 
     if all_results:
         df = pd.DataFrame(all_results)
-        df.to_csv(csv_path, index=False)
+        with timed_write(csv_path):
+            df.to_csv(csv_path, index=False)
+        if store is not None:
+            store.add(store.start_run("optimization"), "optimization", df)
         print(f"\n✅ Optimization results saved to {csv_path}.")
     else:
         print("❌ No valid results to save.")
 
 if __name__ == "__main__":
-    run_optimization_for_all()
+    parser = argparse.ArgumentParser(description="Find the conditions of maximum exergy efficiency per redox pair.")
+    parser.add_argument("--no-plots", action="store_true", help="compute and export data only")
+    parser.add_argument("--preview", action="store_true",
+                        help="fast 72 dpi PNG-only figures instead of publication output (REDOX_RENDER=preview)")
+    parser.add_argument("--ties", action="store_true",
+                        help="also list the (T, pH, log c) points tied at maximum efficiency, ranked by −ΔG")
+    parser.add_argument("--ties-steps", type=int, default=100,
+                        help="grid points per axis (T, pH, log c) for --ties")
+    parser.add_argument("--ties-top", type=int, default=TIES_TOP,
+                        help=f"tied points kept per pair for --ties (default {TIES_TOP})")
+    parser.add_argument("--surrogate", action="store_true",
+                        help="evaluate ΔG from the precomputed tables in surrogates/ (built on first use)")
+    parser.add_argument("--ionic-strength", type=float, default=None, metavar="I",
+                        help="ionic strength (mol/L) for the activity model (REDOX_ACTIVITY); default: ideal solution")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes for the grid evaluation (default: REDOX_WORKERS or 1)")
+    args = parser.parse_args()
+    if args.ionic_strength is not None and not 0 <= args.ionic_strength <= MAX_IONIC_STRENGTH:
+        parser.error(f"--ionic-strength must be within 0–{MAX_IONIC_STRENGTH:g} mol/L")
+    if args.preview:
+        set_render_profile("preview")
+
+    with ResultStore() as store:
+        run_optimization_for_all(store, args.surrogate, args.workers, args.ionic_strength)
+        if args.ties:
+            run_ties_for_all(args.ties_steps, args.ties_top, store, args.surrogate, args.ionic_strength)
 
     # Generate LaTeX table and plots
     import generate_optimal_table
     generate_optimal_table.generate_latex_table()
 
-    import plot_optimal
-    plot_optimal.generate_optimal_plots()
\ No newline at end of file
+    if not args.no_plots:
+        import plot_optimal
+        plot_optimal.generate_optimal_plots()
+
+    # Barrier: every queued figure and table is on disk before we exit
+    flush()
\ No newline at end of file
@@ -6,11 +6,16 @@
 # Generates bar and scatter plots for optimal redox conditions
 
 import os
+import sys
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from main.artifacts import save_figure
+from main.instrumentation import timed
+
 # Paths
 base_dir = os.path.dirname(__file__)
 csv_path = os.path.join(base_dir, "optimal_conditions.csv")
@@ -19,6 +24,10 @@ fig_dir_pdf = os.path.abspath(os.path.join(base_dir, "../report/figures/figures_
 os.makedirs(fig_dir_png, exist_ok=True)
 os.makedirs(fig_dir_pdf, exist_ok=True)
 
+# Seed of the scatter-plot jitter; a fixed seed keeps re-renders byte-identical
+JITTER_SEED = 0
+
+@timed()
 def plot_optimal_exergy_efficiency():
     df = pd.read_csv(csv_path)
     df["Exergy Efficiency (%)"] = pd.to_numeric(df["Exergy Efficiency (%)"], errors="coerce")
@@ -53,11 +62,13 @@ def plot_optimal_exergy_efficiency():
                 "*Values clipped to ±300% for clarity\nSome redox pairs excluded due to undefined exergy efficiency",
                 ha="right", fontsize=8, style="italic")
     plt.tight_layout()
-    plt.savefig(os.path.join(fig_dir_pdf, "optimal_exergy_efficiency.pdf"))
-    plt.savefig(os.path.join(fig_dir_png, "optimal_exergy_efficiency.png"), dpi=300)
+    save_figure(os.path.join(fig_dir_png, "optimal_exergy_efficiency.png"), os.path.join(fig_dir_pdf, "optimal_exergy_efficiency.pdf"))
     plt.close()
 
-def plot_optimal_conditions_scatter():
+@timed()
+def plot_optimal_conditions_scatter(rng=None):
+    # rng: np.random.Generator for the jitter (default: seeded with JITTER_SEED)
+    rng = np.random.default_rng(JITTER_SEED) if rng is None else rng
     df = pd.read_csv(csv_path)
 
     df["Exergy Efficiency (%)"] = pd.to_numeric(df["Exergy Efficiency (%)"], errors="coerce")
@@ -72,8 +83,8 @@ def plot_optimal_conditions_scatter():
     df["Clipped Eff (%)"] = df["Exergy Efficiency (%)"].clip(-100, 100)
     df["Point Size"] = 80 + 0.8 * (df["Clipped Eff (%)"] + 100)
 
-    jittered_pH = df["pH"] + np.random.normal(0, 0.12, size=len(df))
-    jittered_T = df["T (K)"] + np.random.normal(0, 1.2, size=len(df))
+    jittered_pH = df["pH"] + rng.normal(0, 0.12, size=len(df))
+    jittered_T = df["T (K)"] + rng.normal(0, 1.2, size=len(df))
 
     df["Jittered pH"] = jittered_pH
     df["Jittered T"] = jittered_T
@@ -108,10 +119,10 @@ def plot_optimal_conditions_scatter():
                 ha="right", fontsize=8, style="italic")
 
     plt.tight_layout(rect=[0, 0.05, 1, 1])
-    plt.savefig(os.path.join(fig_dir_pdf, "optimal_conditions_scatter.pdf"))
-    plt.savefig(os.path.join(fig_dir_png, "optimal_conditions_scatter.png"), dpi=300)
+    save_figure(os.path.join(fig_dir_png, "optimal_conditions_scatter.png"), os.path.join(fig_dir_pdf, "optimal_conditions_scatter.pdf"))
     plt.close()
 
+@timed()
 def plot_optimal_dG():
     df = pd.read_csv(csv_path)
     plt.figure(figsize=(10, 6))
@@ -128,13 +139,13 @@ def plot_optimal_dG():
     plt.legend().remove()
     plt.grid(True, linestyle="--", alpha=0.5)
     plt.tight_layout()
-    plt.savefig(os.path.join(fig_dir_pdf, "optimal_dG.pdf"))
-    plt.savefig(os.path.join(fig_dir_png, "optimal_dG.png"), dpi=300)
+    save_figure(os.path.join(fig_dir_png, "optimal_dG.png"), os.path.join(fig_dir_pdf, "optimal_dG.pdf"))
     plt.close()
 
-def generate_optimal_plots():
+@timed()
+def generate_optimal_plots(seed=JITTER_SEED):
     plot_optimal_exergy_efficiency()
-    plot_optimal_conditions_scatter()
+    plot_optimal_conditions_scatter(np.random.default_rng(seed))
     plot_optimal_dG()
     print("✅ Optimization plots saved to both figures_optimization/ and report/figures/figures_optimization/.")
 
@@ -1,24 +1,28 @@
 import os
+import sys
 import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 import matplotlib.patches as mpatches
 from matplotlib.lines import Line2D
-from scipy.stats import linregress
 
-from main.thermodynamics import calculate_Q, adjust_E0, calculate_deltaG
-from main.data import redox_pairs
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from main.records import PAIRS
+from main.artifacts import save_figure
+from main.instrumentation import timed
 
 # Paths
-summary_path = "sensitivity/sensitivity_summary.csv"
-png_dir      = "sensitivity/figures_summary"
-pdf_dir      = "report/figures/figures_sensitivity_summary"
+base_dir     = os.path.dirname(os.path.abspath(__file__))
+summary_path = os.path.join(base_dir, "sensitivity_summary.csv")
+png_dir      = os.path.join(base_dir, "figures_summary")
+pdf_dir      = os.path.join(base_dir, "../report/figures/figures_sensitivity_summary")
 os.makedirs(png_dir, exist_ok=True)
 os.makedirs(pdf_dir, exist_ok=True)
 
 # Color palette for stability
 PALETTE = {"Stable": "#4CAF50", "Moderate": "#FFC107", "Sensitive": "#F44336"}
 
+@timed()
 def plot_stability_scatter():
     df = pd.read_csv(summary_path)
     df["Directional Fragility"] = df["ΔG Range (T)"].fillna(0) - df["ΔG Range (pH)"].fillna(0)
@@ -87,10 +91,11 @@ def plot_stability_scatter():
     ax.grid(True, linestyle="--", alpha=0.5)
 
     fig.tight_layout()
-    fig.savefig(os.path.join(png_dir, "stability_scatter_plot.png"), dpi=300, bbox_inches="tight")
-    fig.savefig(os.path.join(pdf_dir, "stability_scatter_plot.pdf"), bbox_inches="tight")
+    save_figure(os.path.join(png_dir, "stability_scatter_plot.png"),
+                os.path.join(pdf_dir, "stability_scatter_plot.pdf"), fig=fig, bbox_inches="tight")
     plt.close(fig)
 
+@timed()
 def plot_directional_fragility():
     df = pd.read_csv(summary_path)
     df["Directional Fragility"] = df["ΔG Range (T)"].fillna(0) - df["ΔG Range (pH)"].fillna(0)
@@ -118,11 +123,12 @@ def plot_directional_fragility():
     ax.legend(handles=stability_legend, title="Stability", loc="lower left")
 
     fig.tight_layout()
-    fig.savefig(os.path.join(png_dir, "directional_fragility_bar.png"), dpi=300)
-    fig.savefig(os.path.join(pdf_dir, "directional_fragility_bar.pdf"))
+    save_figure(os.path.join(png_dir, "directional_fragility_bar.png"),
+                os.path.join(pdf_dir, "directional_fragility_bar.pdf"), fig=fig)
     plt.close(fig)
     print("✅ Final fragility bar chart saved.")
 
+@timed()
 def plot_concentration_sensitivity():
     T = 300
     pH = 7
@@ -130,26 +136,17 @@ def plot_concentration_sensitivity():
 
     plt.figure(figsize=(10, 6))
 
-    for pair in redox_pairs:
-        name = pair["name"]
-        reactants = list(pair.get("reactants", {}).keys())
+    for pair in PAIRS:
+        name = pair.name
+        reactants = list(pair.reactants)
         species = next((s for s in reactants if s != "H+"), reactants[0] if reactants else None)
         if species is None:
             continue
 
-        dG_vals = []
-        for conc_val in 10 ** concentrations:
-            conc_copy = pair.get("conc", {}).copy()
-            conc_copy[species] = conc_val
-            if "H+" in conc_copy:
-                conc_copy["H+"] = 10 ** (-pH)
+        dG = pair.deltaG(T, pH, conc={species: 10 ** concentrations})
+        dG_vals = np.broadcast_to(dG / 1000, concentrations.shape)
 
-            Q = calculate_Q({**pair, "conc": conc_copy})
-            E = adjust_E0(pair["E0"], pair["n"], T, Q)
-            dG = calculate_deltaG(E, pair["n"])
-            dG_vals.append(dG / 1000)
-
-        slope, _, _, _, _ = linregress(concentrations, dG_vals)
+        slope = np.polyfit(concentrations, dG_vals, 1)[0]
         label = f"{name} (slope: {slope:.2f})"
         plt.plot(concentrations, dG_vals, label=label)
 
@@ -159,11 +156,12 @@ def plot_concentration_sensitivity():
     plt.grid(True, linestyle="--", alpha=0.5)
     plt.legend(fontsize=8)
     plt.tight_layout()
-    plt.savefig(os.path.join(png_dir, "concentration_sensitivity.png"), dpi=300)
-    plt.savefig(os.path.join(pdf_dir, "concentration_sensitivity.pdf"))
+    save_figure(os.path.join(png_dir, "concentration_sensitivity.png"),
+                os.path.join(pdf_dir, "concentration_sensitivity.pdf"))
     plt.close()
     print("✅ Concentration sensitivity plot saved.")
 
+@timed()
 def generate_all_sensitivity_plots():
     plot_stability_scatter()
     plot_directional_fragility()
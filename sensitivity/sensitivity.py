@@ -2,148 +2,165 @@
 
 import os
 import sys
+import argparse
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 
 # Allow import of main/ modules
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from main.thermodynamics import (
-    calculate_Q,
-    adjust_E0,
-    calculate_deltaG,
-    calculate_exergy_efficiency_from_H
-)
-from main.data import redox_pairs
+from main.records import PAIRS
+from main.activity import MAX_IONIC_STRENGTH
+from main.artifacts import save_figure, flush, set_render_profile
+from main.result_store import ResultStore
+from main.surrogate import get_surrogate
+from main.parallel import map_into
+from main.instrumentation import timed, stage, count, timed_write
 import sensitivity_summary
-from plot_sensitivity import generate_all_sensitivity_plots
 
 # Paths
-figures_path = "sensitivity/figures_sensitivity"
-data_path = "sensitivity/data_sensitivity"
-report_fig_path = "report/figures/figures_sensitivity"
+base_dir = os.path.dirname(os.path.abspath(__file__))
+figures_path = os.path.join(base_dir, "figures_sensitivity")
+data_path = os.path.join(base_dir, "data_sensitivity")
+report_fig_path = os.path.join(base_dir, "../report/figures/figures_sensitivity")
 os.makedirs(figures_path, exist_ok=True)
 os.makedirs(data_path, exist_ok=True)
 os.makedirs(report_fig_path, exist_ok=True)
 
+# Sweep grids
+T_fixed = 300.0
+pH_range = np.linspace(4, 10, 50)
+T_range = np.linspace(280, 400, 50)
+fixed_pH = 7.0
+
 def safe_filename(name):
     return name.replace("/", "_").replace("^", "").replace("+", "p").replace("-", "m")
 
-def run_sensitivity_analysis():
-    for pair in redox_pairs:
-        print(f"▶ Running pH and T sensitivity sweeps for {pair['name']}...")
-        safe_name = safe_filename(pair["name"])
+@timed()
+def plot_sweep(x, y, xlabel, ylabel, title, color, stem):
+    # matplotlib is only imported once a figure is actually rendered
+    import matplotlib.pyplot as plt
+
+    plt.figure()
+    plt.plot(x, y, label=ylabel, color=color)
+    plt.xlabel(xlabel)
+    plt.ylabel(ylabel)
+    plt.title(title)
+    plt.grid(True)
+    plt.tight_layout()
+    save_figure(f"{figures_path}/{stem}.png", f"{report_fig_path}/{stem}.pdf")
+    plt.close()
+
+def _sweep_into(arrays, p, use_surrogate, ionic_strength):
+    # Pool task: both sweeps of PAIRS[p], written into row p of the shared outputs
+    pair = PAIRS[p]
+    # ΔG from the exact kernel or from the pair's precomputed table
+    if use_surrogate:
+        deltaG = get_surrogate(pair, ionic_strength=ionic_strength).deltaG
+    else:
+        deltaG = lambda T, pH: pair.deltaG(T, pH, I=ionic_strength)
+    dG = deltaG(T_fixed, arrays["pH_range"])
+    arrays["dG_pH"][p] = dG
+    arrays["ex_pH"][p] = pair.exergy_efficiency_H(dG)  # NaN throughout when ΔH = 0
+    dG = deltaG(arrays["T_range"], fixed_pH)
+    arrays["dG_T"][p] = dG
+    arrays["ex_T"][p] = pair.exergy_efficiency_H(dG)
+
+@timed()
+def run_sensitivity_analysis(render=True, store=None, use_surrogates=False, workers=None, ionic_strength=None):
+    run_id = store.start_run("sensitivity") if store is not None else None
+    if use_surrogates:
+        for pair in PAIRS:
+            get_surrogate(pair, ionic_strength=ionic_strength)  # built here once, then memory-mapped by every worker
+
+    # All sweeps first, one task per pair, into preallocated (pairs, points) arrays
+    outputs = {name: ((len(PAIRS), len(pH_range)), float) for name in ("dG_pH", "ex_pH")}
+    outputs.update({name: ((len(PAIRS), len(T_range)), float) for name in ("dG_T", "ex_T")})
+    with stage("sensitivity sweep compute"):
+        sweeps = map_into(_sweep_into, [(p, use_surrogates, ionic_strength) for p in range(len(PAIRS))], outputs,
+                          inputs={"pH_range": pH_range, "T_range": T_range}, workers=workers)
+    count("sensitivity sweep compute", len(PAIRS) * (len(pH_range) + len(T_range)))
+
+    for p, pair in enumerate(PAIRS):
+        print(f"▶ Running pH and T sensitivity sweeps for {pair.name}...")
+        safe_name = safe_filename(pair.name)
 
         # === pH sweep at fixed T ===
-        T_fixed = 300.0
-        pH_range = np.linspace(4, 10, 50)
-        dG_pH = []
-        ex_pH = []
-
-        for pH in pH_range:
-            conc = pair["conc"].copy()
-            if "H+" in conc:
-                conc["H+"] = 10 ** (-pH)
-            Q = calculate_Q({**pair, "conc": conc})
-            E = adjust_E0(pair['E0'], pair['n'], T_fixed, Q)
-            dG = calculate_deltaG(E, pair['n'])
-
-            # Safe exergy efficiency
-            ex_eff = np.nan if abs(pair['delta_H']) < 1e-8 else calculate_exergy_efficiency_from_H(dG, pair['delta_H'])
-
-            dG_pH.append(dG / 1000)
-            ex_pH.append(ex_eff)
+        dG_pH = sweeps["dG_pH"][p] / 1000
+        ex_pH = sweeps["ex_pH"][p]
 
         df_pH = pd.DataFrame({
             "pH": pH_range,
             "ΔG (kJ/mol)": dG_pH,
             "Exergy Efficiency (%)": ex_pH
         })
-        df_pH.to_csv(f"{data_path}/{safe_name}_pH_sweep.csv", index=False)
-
-        # Plot ΔG vs pH
-        plt.figure()
-        plt.plot(pH_range, dG_pH, label="ΔG (kJ/mol)", color="blue")
-        plt.xlabel("pH")
-        plt.ylabel("ΔG (kJ/mol)")
-        plt.title(f"ΔG vs pH for {pair['name']}")
-        plt.grid(True)
-        plt.tight_layout()
-        plt.savefig(f"{report_fig_path}/{safe_name}_dg_vs_pH.pdf")
-        plt.savefig(f"{figures_path}/{safe_name}_dg_vs_pH.png", dpi=300)
-        plt.close()
-
-        # Plot Exergy vs pH
-        if not np.all(np.isnan(ex_pH)):
-            ex_pH_arr = np.array(ex_pH)
-            valid_mask = ~np.isnan(ex_pH_arr)
-            plt.figure()
-            plt.plot(pH_range[valid_mask], ex_pH_arr[valid_mask], label="Exergy Efficiency (%)", color="green")
-            plt.xlabel("pH")
-            plt.ylabel("Exergy Efficiency (%)")
-            plt.title(f"Exergy vs pH for {pair['name']}")
-            plt.grid(True)
-            plt.tight_layout()
-            plt.savefig(f"{report_fig_path}/{safe_name}_exergy_vs_pH.pdf")
-            plt.savefig(f"{figures_path}/{safe_name}_exergy_vs_pH.png", dpi=300)
-            plt.close()
+        with timed_write(f"{data_path}/{safe_name}_pH_sweep.csv"):
+            df_pH.to_csv(f"{data_path}/{safe_name}_pH_sweep.csv", index=False)
+        if store is not None:
+            store.add(run_id, "sweep_pH", df_pH, pair=pair.name, T=T_fixed)
+
+        if render:
+            # Plot ΔG vs pH
+            plot_sweep(pH_range, dG_pH, "pH", "ΔG (kJ/mol)",
+                       f"ΔG vs pH for {pair.name}", "blue", f"{safe_name}_dg_vs_pH")
+
+            # Plot Exergy vs pH
+            if not np.all(np.isnan(ex_pH)):
+                valid_mask = ~np.isnan(ex_pH)
+                plot_sweep(pH_range[valid_mask], ex_pH[valid_mask], "pH", "Exergy Efficiency (%)",
+                           f"Exergy vs pH for {pair.name}", "green", f"{safe_name}_exergy_vs_pH")
 
         # === T sweep at fixed pH ===
-        T_range = np.linspace(280, 400, 50)
-        dG_T = []
-        ex_T = []
-        fixed_pH = 7.0
-        conc = pair["conc"].copy()
-        if "H+" in conc:
-            conc["H+"] = 10 ** (-fixed_pH)
-
-        for T in T_range:
-            Q = calculate_Q({**pair, "conc": conc})
-            E = adjust_E0(pair['E0'], pair['n'], T, Q)
-            dG = calculate_deltaG(E, pair['n'])
-            ex_eff = np.nan if abs(pair['delta_H']) < 1e-8 else calculate_exergy_efficiency_from_H(dG, pair['delta_H'])
-
-            dG_T.append(dG / 1000)
-            ex_T.append(ex_eff)
+        dG_T = sweeps["dG_T"][p] / 1000
+        ex_T = sweeps["ex_T"][p]
 
         df_T = pd.DataFrame({
             "T (K)": T_range,
             "ΔG (kJ/mol)": dG_T,
             "Exergy Efficiency (%)": ex_T
         })
-        df_T.to_csv(f"{data_path}/{safe_name}_T_sweep.csv", index=False)
-
-        # Plot ΔG vs T
-        plt.figure()
-        plt.plot(T_range, dG_T, label="ΔG (kJ/mol)", color="orange")
-        plt.xlabel("Temperature (K)")
-        plt.ylabel("ΔG (kJ/mol)")
-        plt.title(f"ΔG vs Temperature for {pair['name']}")
-        plt.grid(True)
-        plt.tight_layout()
-        plt.savefig(f"{report_fig_path}/{safe_name}_dg_vs_T.pdf")
-        plt.savefig(f"{figures_path}/{safe_name}_dg_vs_T.png", dpi=300)
-        plt.close()
-
-        # Plot Exergy vs T
-        if not np.all(np.isnan(ex_T)):
-            ex_T_arr = np.array(ex_T)
-            valid_mask_T = ~np.isnan(ex_T_arr)
-            plt.figure()
-            plt.plot(T_range[valid_mask_T], ex_T_arr[valid_mask_T], label="Exergy Efficiency (%)", color="purple")
-            plt.xlabel("Temperature (K)")
-            plt.ylabel("Exergy Efficiency (%)")
-            plt.title(f"Exergy vs Temperature for {pair['name']}")
-            plt.grid(True)
-            plt.tight_layout()
-            plt.savefig(f"{report_fig_path}/{safe_name}_exergy_vs_T.pdf")
-            plt.savefig(f"{figures_path}/{safe_name}_exergy_vs_T.png", dpi=300)
-            plt.close()
-
-    print("✅ Sensitivity sweeps complete. Data saved and plotted.")
+        with timed_write(f"{data_path}/{safe_name}_T_sweep.csv"):
+            df_T.to_csv(f"{data_path}/{safe_name}_T_sweep.csv", index=False)
+        if store is not None:
+            store.add(run_id, "sweep_T", df_T, pair=pair.name, pH=fixed_pH)
+
+        if render:
+            # Plot ΔG vs T
+            plot_sweep(T_range, dG_T, "Temperature (K)", "ΔG (kJ/mol)",
+                       f"ΔG vs Temperature for {pair.name}", "orange", f"{safe_name}_dg_vs_T")
+
+            # Plot Exergy vs T
+            if not np.all(np.isnan(ex_T)):
+                valid_mask_T = ~np.isnan(ex_T)
+                plot_sweep(T_range[valid_mask_T], ex_T[valid_mask_T], "Temperature (K)", "Exergy Efficiency (%)",
+                           f"Exergy vs Temperature for {pair.name}", "purple", f"{safe_name}_exergy_vs_T")
+
+    print("✅ Sensitivity sweeps complete." + (" Data saved and plotted." if render else " Data saved."))
 
 if __name__ == "__main__":
-    run_sensitivity_analysis()
+    parser = argparse.ArgumentParser(description="Sensitivity sweeps, summary table and plots.")
+    parser.add_argument("--no-plots", action="store_true", help="compute and export data only")
+    parser.add_argument("--preview", action="store_true",
+                        help="fast 72 dpi PNG-only figures instead of publication output (REDOX_RENDER=preview)")
+    parser.add_argument("--surrogate", action="store_true",
+                        help="evaluate ΔG from the precomputed tables in surrogates/ (built on first use)")
+    parser.add_argument("--ionic-strength", type=float, default=None, metavar="I",
+                        help="ionic strength (mol/L) for the activity model (REDOX_ACTIVITY); default: ideal solution")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes for the sweeps (default: REDOX_WORKERS or 1)")
+    args = parser.parse_args()
+    if args.ionic_strength is not None and not 0 <= args.ionic_strength <= MAX_IONIC_STRENGTH:
+        parser.error(f"--ionic-strength must be within 0–{MAX_IONIC_STRENGTH:g} mol/L")
+    if args.preview:
+        set_render_profile("preview")
+
+    with ResultStore() as store:
+        run_sensitivity_analysis(render=not args.no_plots, store=store, use_surrogates=args.surrogate,
+                                 workers=args.workers, ionic_strength=args.ionic_strength)
     sensitivity_summary.generate_summary_table()
-    generate_all_sensitivity_plots()
\ No newline at end of file
+    if not args.no_plots:
+        from plot_sensitivity import generate_all_sensitivity_plots
+        generate_all_sensitivity_plots()
+
+    # Barrier: every queued figure and table is on disk before we exit
+    flush()
\ No newline at end of file
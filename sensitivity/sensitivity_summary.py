@@ -1,12 +1,26 @@
 import os
+import sys
 import pandas as pd
 import numpy as np
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from main.table_export import write_latex_table
+from main.instrumentation import timed, timed_write
+
 # Paths
-data_dir = "sensitivity/data_sensitivity"
-summary_csv = "sensitivity/sensitivity_summary.csv"
-summary_tex = "report/tables/table_sensitivity_summary.tex"
-os.makedirs(os.path.dirname(summary_tex), exist_ok=True)
+base_dir = os.path.dirname(os.path.abspath(__file__))
+data_dir = os.path.join(base_dir, "data_sensitivity")
+summary_csv = os.path.join(base_dir, "sensitivity_summary.csv")
+summary_tex = os.path.join(base_dir, "../report/tables/table_sensitivity_summary.tex")
+
+SUMMARY_COLUMNS = [
+    ("Redox Pair", None),
+    ("ΔG Range (pH)", None),
+    ("ΔG Range (T)", None),
+    ("Exergy Range (pH)", "%.2f\\%%", "–"),
+    ("Exergy Range (T)", "%.2f\\%%", "–"),
+    ("Stability", None),
+]
 
 # Thresholds for stability classification
 DG_THRESHOLDS = (10, 50)  # kJ/mol
@@ -20,6 +34,7 @@ def classify_stability(dg_range, ex_range):
     else:
         return "Sensitive"
 
+@timed()
 def generate_summary_table():
     records = []
 
@@ -61,23 +76,14 @@ def generate_summary_table():
 
     # Save to CSV
     df_summary = pd.DataFrame(records)
-    df_summary.to_csv(summary_csv, index=False)
+    with timed_write(summary_csv):
+        df_summary.to_csv(summary_csv, index=False)
 
     # Save to LaTeX
-    with open(summary_tex, "w") as f:
-        f.write("\\begin{tabular}{lccccc}\n")
-        f.write("\\toprule\n")
-        f.write("Redox Pair & $\\Delta G_{pH}$ & $\\Delta G_T$ & Exergy$_{pH}$ & Exergy$_T$ & Stability \\\\ \n")
-        f.write("\\midrule\n")
-
-        for _, row in df_summary.iterrows():
-            ex_pH_str = f"{row['Exergy Range (pH)']:.2f}\\%" if not pd.isna(row['Exergy Range (pH)']) else "–"
-            ex_T_str  = f"{row['Exergy Range (T)']:.2f}\\%" if not pd.isna(row['Exergy Range (T)']) else "–"
-
-            f.write(f"{row['Redox Pair']} & {row['ΔG Range (pH)']} & {row['ΔG Range (T)']} & "
-                    f"{ex_pH_str} & {ex_T_str} & {row['Stability']} \\\\ \n")
-
-        f.write("\\bottomrule\n")
-        f.write("\\end{tabular}\n")
+    write_latex_table(
+        df_summary, summary_tex, SUMMARY_COLUMNS,
+        col_spec="lccccc",
+        header="Redox Pair & $\\Delta G_{pH}$ & $\\Delta G_T$ & Exergy$_{pH}$ & Exergy$_T$ & Stability \\\\ \n",
+    )
 
     print(f"✅ Summary table saved to {summary_csv} and {summary_tex}")